@@ -7,191 +7,271 @@ AgentFlow工作流执行器
 import json
 import sys
 import os
+import re
 import subprocess
+import tempfile
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Any
 
+# 同目录的关键词匹配模块（以模块方式加载时脚本目录不在sys.path中）
+sys.path.insert(0, str(Path(__file__).parent))
+
+from keyword_rules import build_keyword_automaton, matched_rule_indexes
+
+try:
+    import orjson  # 可选依赖，状态日志序列化更快
+except ImportError:
+    orjson = None
+
+# 工作流请求匹配模式（模块加载时预编译）
+_WORKFLOW_REQUEST_PATTERNS = tuple(re.compile(p) for p in (
+    r'协调工作流[：:]\s*([^\s-]+)\s*-\s*(.+)',
+    r'启动AgentFlow.*执行\s*(.+)',
+    r'使用工作流管理器处理\s*(.+)',
+    r'执行工作流[：:]\s*([^\s-]+)\s*-\s*(.+)'
+))
+
+# 关键词 → 工作流类型 规则表（按优先级排列）
+_WORKFLOW_TYPE_RULES = (
+    (('开发', '系统', '软件', '应用'), "system_development"),
+    (('数据', '分析', '统计', '建模'), "data_analysis"),
+    (('安全', '审计', '漏洞', '合规'), "security_audit"),
+    (('运维', 'devops', '自动化', '部署'), "devops_automation"),
+)
+
+_KEYWORD_AUTOMATON = build_keyword_automaton(_WORKFLOW_TYPE_RULES)
+
+
+def _matched_rule_indexes(text):
+    """单次扫描text，返回命中的规则下标集合"""
+    return matched_rule_indexes(_WORKFLOW_TYPE_RULES, _KEYWORD_AUTOMATON, text)
+
+
+def _dumps_state(obj) -> bytes:
+    """序列化状态记录为UTF-8字节"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+
+_loads_state = orjson.loads if orjson is not None else json.loads
+
+# 预定义工作流模板（模块加载时构建，只读）
+Phase = namedtuple("Phase", "name agents description")
+Workflow = namedtuple("Workflow", "name description phases")
+
+_WORKFLOWS = {
+    "system_development": Workflow(
+        "系统开发工作流",
+        "完整的软件开发流程",
+        (
+            Phase("需求分析", ("business-analyst", "system-architect"),
+                  "分析用户需求，制定技术规格"),
+            Phase("架构设计", ("cloud-architect", "backend-architect", "database-architect"),
+                  "设计系统架构，选择技术栈"),
+            Phase("开发实施", ("python-pro", "web-developer", "test-automator"),
+                  "编码实现，单元测试"),
+            Phase("测试验证", ("quality-assurance", "security-auditor", "performance-engineer"),
+                  "集成测试，性能优化"),
+            Phase("部署上线", ("devops-engineer", "monitoring-specialist"),
+                  "环境部署，监控配置"),
+        )
+    ),
+    "data_analysis": Workflow(
+        "数据分析工作流",
+        "端到端数据分析流程",
+        (
+            Phase("数据收集", ("data-engineer", "database-analyst"),
+                  "收集原始数据，数据源连接"),
+            Phase("数据清洗", ("data-scientist", "python-pro"),
+                  "数据预处理，异常值处理"),
+            Phase("分析建模", ("data-scientist", "quant-analyst", "statistician"),
+                  "统计分析，机器学习建模"),
+            Phase("结果可视化", ("data-analyst", "ui-ux-designer"),
+                  "图表制作，报告生成"),
+            Phase("报告生成", ("technical-writer", "business-analyst"),
+                  "撰写分析报告，提供决策建议"),
+        )
+    ),
+    "security_audit": Workflow(
+        "安全审计工作流",
+        "全面的安全评估和加固",
+        (
+            Phase("安全评估", ("security-architect", "risk-manager"),
+                  "安全风险评估，威胁建模"),
+            Phase("漏洞扫描", ("security-auditor", "penetration-tester"),
+                  "自动化扫描，手动渗透测试"),
+            Phase("风险分析", ("risk-manager", "compliance-auditor"),
+                  "风险等级评估，合规检查"),
+            Phase("安全加固", ("backend-security-coder", "devops-engineer"),
+                  "代码安全修复，基础设施加固"),
+            Phase("合规检查", ("compliance-auditor", "legal-advisor"),
+                  "合规性验证，文档更新"),
+        )
+    ),
+    "devops_automation": Workflow(
+        "DevOps自动化工作流",
+        "CI/CD和运维自动化实施",
+        (
+            Phase("环境搭建", ("infrastructure-engineer", "cloud-engineer"),
+                  "基础设施准备，云环境配置"),
+            Phase("CI/CD配置", ("devops-engineer", "test-automator"),
+                  "构建流水线，自动化测试"),
+            Phase("监控部署", ("monitoring-specialist", "site-reliability-engineer"),
+                  "监控系统搭建，告警配置"),
+            Phase("性能优化", ("performance-engineer", "backend-architect"),
+                  "性能调优，资源优化"),
+            Phase("运维维护", ("devops-engineer", "monitoring-specialist"),
+                  "日常运维，故障处理"),
+        )
+    ),
+}
+
+
+def _workflow_as_dict(workflow):
+    """把工作流模板转换为可JSON序列化的dict"""
+    return {
+        "name": workflow.name,
+        "description": workflow.description,
+        "phases": [phase._asdict() for phase in workflow.phases]
+    }
+
+
+# Agent输出超过该字节数时写入文件，状态中只保留预览和文件路径
+_INLINE_OUTPUT_LIMIT = 64 * 1024
+_OUTPUT_PREVIEW_CHARS = 2000
+
+
 class AgentFlowExecutor:
     def __init__(self):
         self.flow_bin_path = "/mnt/d/flow/bin/flow"
         self.flow_project_path = "/mnt/d/flow"
-        self.workflow_state_file = os.path.expanduser("~/.claude/agentflow_workflow.json")
-        self.workflows = self._get_predefined_workflows()
-
-    def _get_predefined_workflows(self):
-        """获取预定义的工作流模板"""
-        return {
-            "system_development": {
-                "name": "系统开发工作流",
-                "description": "完整的软件开发流程",
-                "phases": [
-                    {
-                        "name": "需求分析",
-                        "agents": ["business-analyst", "system-architect"],
-                        "description": "分析用户需求，制定技术规格"
-                    },
-                    {
-                        "name": "架构设计",
-                        "agents": ["cloud-architect", "backend-architect", "database-architect"],
-                        "description": "设计系统架构，选择技术栈"
-                    },
-                    {
-                        "name": "开发实施",
-                        "agents": ["python-pro", "web-developer", "test-automator"],
-                        "description": "编码实现，单元测试"
-                    },
-                    {
-                        "name": "测试验证",
-                        "agents": ["quality-assurance", "security-auditor", "performance-engineer"],
-                        "description": "集成测试，性能优化"
-                    },
-                    {
-                        "name": "部署上线",
-                        "agents": ["devops-engineer", "monitoring-specialist"],
-                        "description": "环境部署，监控配置"
-                    }
-                ]
-            },
-            "data_analysis": {
-                "name": "数据分析工作流",
-                "description": "端到端数据分析流程",
-                "phases": [
-                    {
-                        "name": "数据收集",
-                        "agents": ["data-engineer", "database-analyst"],
-                        "description": "收集原始数据，数据源连接"
-                    },
-                    {
-                        "name": "数据清洗",
-                        "agents": ["data-scientist", "python-pro"],
-                        "description": "数据预处理，异常值处理"
-                    },
-                    {
-                        "name": "分析建模",
-                        "agents": ["data-scientist", "quant-analyst", "statistician"],
-                        "description": "统计分析，机器学习建模"
-                    },
-                    {
-                        "name": "结果可视化",
-                        "agents": ["data-analyst", "ui-ux-designer"],
-                        "description": "图表制作，报告生成"
-                    },
-                    {
-                        "name": "报告生成",
-                        "agents": ["technical-writer", "business-analyst"],
-                        "description": "撰写分析报告，提供决策建议"
-                    }
-                ]
-            },
-            "security_audit": {
-                "name": "安全审计工作流",
-                "description": "全面的安全评估和加固",
-                "phases": [
-                    {
-                        "name": "安全评估",
-                        "agents": ["security-architect", "risk-manager"],
-                        "description": "安全风险评估，威胁建模"
-                    },
-                    {
-                        "name": "漏洞扫描",
-                        "agents": ["security-auditor", "penetration-tester"],
-                        "description": "自动化扫描，手动渗透测试"
-                    },
-                    {
-                        "name": "风险分析",
-                        "agents": ["risk-manager", "compliance-auditor"],
-                        "description": "风险等级评估，合规检查"
-                    },
-                    {
-                        "name": "安全加固",
-                        "agents": ["backend-security-coder", "devops-engineer"],
-                        "description": "代码安全修复，基础设施加固"
-                    },
-                    {
-                        "name": "合规检查",
-                        "agents": ["compliance-auditor", "legal-advisor"],
-                        "description": "合规性验证，文档更新"
-                    }
-                ]
-            },
-            "devops_automation": {
-                "name": "DevOps自动化工作流",
-                "description": "CI/CD和运维自动化实施",
-                "phases": [
-                    {
-                        "name": "环境搭建",
-                        "agents": ["infrastructure-engineer", "cloud-engineer"],
-                        "description": "基础设施准备，云环境配置"
-                    },
-                    {
-                        "name": "CI/CD配置",
-                        "agents": ["devops-engineer", "test-automator"],
-                        "description": "构建流水线，自动化测试"
-                    },
-                    {
-                        "name": "监控部署",
-                        "agents": ["monitoring-specialist", "site-reliability-engineer"],
-                        "description": "监控系统搭建，告警配置"
-                    },
-                    {
-                        "name": "性能优化",
-                        "agents": ["performance-engineer", "backend-architect"],
-                        "description": "性能调优，资源优化"
-                    },
-                    {
-                        "name": "运维维护",
-                        "agents": ["devops-engineer", "monitoring-specialist"],
-                        "description": "日常运维，故障处理"
-                    }
-                ]
-            }
-        }
+        self.workflow_state_file = os.path.expanduser("~/.claude/agentflow_workflow.jsonl")
+        self._legacy_state_file = os.path.expanduser("~/.claude/agentflow_workflow.json")
+        self._legacy_checked = False
+        self.output_dir = os.path.expanduser("~/.claude/agentflow_outputs")
+        self._pending_states = {}
+        self.workflows = _WORKFLOWS
 
     def save_workflow_state(self, workflow_id: str, state: Dict[str, Any]):
-        """保存工作流状态"""
-        try:
-            os.makedirs(os.path.dirname(self.workflow_state_file), exist_ok=True)
+        """暂存工作流状态，由 flush_workflow_state 统一写入"""
+        self._pending_states[workflow_id] = state
+        return True
+
+    def _migrate_legacy_state(self) -> bool:
+        """首次访问时把旧版 agentflow_workflow.json 迁移为JSONL日志；迁移失败时返回False"""
+        if self._legacy_checked:
+            return True
+
+        if not os.path.exists(self.workflow_state_file) and os.path.exists(self._legacy_state_file):
+            try:
+                with open(self._legacy_state_file, 'rb') as f:
+                    all_states = _loads_state(f.read())
+                self._write_workflow_log(all_states)
+            except Exception:
+                return False  # 保留旧文件，下次再试
+
+            try:
+                os.remove(self._legacy_state_file)
+            except OSError:
+                pass  # 日志已存在，旧文件不会再被读取
+
+        self._legacy_checked = True
+        return True
+
+    def _write_workflow_log(self, all_states: Dict[str, Any]):
+        """整体重写状态日志，每个工作流只保留一行"""
+        os.makedirs(os.path.dirname(self.workflow_state_file), exist_ok=True)
+        tmp_file = self.workflow_state_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            for workflow_id, state in all_states.items():
+                f.write(_dumps_state({"id": workflow_id, "state": state}) + b"\n")
+        os.replace(tmp_file, self.workflow_state_file)
+
+    def flush_workflow_state(self):
+        """把暂存的工作流状态一次性追加写入JSONL日志"""
+        if not self._pending_states:
+            return True
 
-            # 读取现有状态
-            if os.path.exists(self.workflow_state_file):
-                with open(self.workflow_state_file, 'r') as f:
-                    all_states = json.load(f)
-            else:
-                all_states = {}
+        # 旧版状态未迁移成功前不创建日志，否则旧状态会被永久忽略
+        if not self._migrate_legacy_state():
+            return False
 
-            all_states[workflow_id] = state
+        try:
+            os.makedirs(os.path.dirname(self.workflow_state_file), exist_ok=True)
 
-            with open(self.workflow_state_file, 'w') as f:
-                json.dump(all_states, f)
+            records = b"".join(
+                _dumps_state({"id": workflow_id, "state": state}) + b"\n"
+                for workflow_id, state in self._pending_states.items()
+            )
+            with open(self.workflow_state_file, 'ab') as f:
+                f.write(records)
 
+            self._pending_states.clear()
             return True
         except Exception:
             return False
 
+    def _read_workflow_log(self):
+        """读取状态日志，返回 (每个工作流的最新状态, 日志行数)"""
+        if not self._migrate_legacy_state():
+            # 迁移失败时直接读取旧版文件，行数按工作流数计，不触发压缩
+            with open(self._legacy_state_file, 'rb') as f:
+                all_states = _loads_state(f.read())
+            return all_states, len(all_states)
+
+        all_states = {}
+        line_count = 0
+        try:
+            with open(self.workflow_state_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    line_count += 1
+                    try:
+                        record = _loads_state(line)
+                    except ValueError:
+                        continue  # 跳过写入中断产生的残缺行
+                    all_states[record["id"]] = record["state"]
+        except FileNotFoundError:
+            pass
+        return all_states, line_count
+
     def load_workflow_state(self, workflow_id: str):
         """加载工作流状态"""
         try:
-            if os.path.exists(self.workflow_state_file):
-                with open(self.workflow_state_file, 'r') as f:
-                    all_states = json.load(f)
-                return all_states.get(workflow_id, {})
-            return {}
+            if workflow_id in self._pending_states:
+                return self._pending_states[workflow_id]
+            all_states, _ = self._read_workflow_log()
+            return all_states.get(workflow_id, {})
         except Exception:
             return {}
 
+    def compact(self, max_ratio: int = 1):
+        """已被覆盖的旧状态行数超过存活工作流数的 max_ratio 倍时压缩日志
+
+        每个工作流执行一次会写入多行快照（启动、每个阶段、完成），
+        按总行数判断时阈值永远达不到，因此只统计被覆盖的行
+        """
+        try:
+            all_states, line_count = self._read_workflow_log()
+            if line_count - len(all_states) <= max_ratio * len(all_states):
+                return False
+
+            self._write_workflow_log(all_states)
+            return True
+        except Exception:
+            return False
+
     def parse_workflow_request(self, user_input: str):
         """解析用户输入中的工作流请求"""
         # 匹配工作流请求模式
-        patterns = [
-            r'协调工作流[：:]\s*([^\s-]+)\s*-\s*(.+)',
-            r'启动AgentFlow.*执行\s*(.+)',
-            r'使用工作流管理器处理\s*(.+)',
-            r'执行工作流[：:]\s*([^\s-]+)\s*-\s*(.+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, user_input)
+        for pattern in _WORKFLOW_REQUEST_PATTERNS:
+            match = pattern.search(user_input)
             if match:
                 workflow_type = match.group(1) if len(match.groups()) > 1 else "system_development"
                 project_desc = match.group(2) if len(match.groups()) > 1 else match.group(1)
@@ -199,55 +279,64 @@ class AgentFlowExecutor:
 
         return None, None
 
-    def execute_phase(self, workflow_id: str, phase: Dict[str, Any], project_context: str):
-        """执行工作流阶段"""
-        phase_name = phase["name"]
-        agents = phase["agents"]
-        phase_description = phase["description"]
-
-        results = []
-        start_time = time.time()
-
-        for agent in agents:
-            agent_result = {
-                "agent": agent,
-                "phase": phase_name,
-                "start_time": datetime.now().isoformat(),
-                "task": f"{phase_description} - {agent}专项任务",
-                "status": "running"
-            }
+    def execute_phase(self, workflow_id: str, phase: Phase, project_context: str):
+        """执行工作流阶段（阶段内的Agent相互独立，并发执行）"""
+        phase_name = phase.name
+        agents = phase.agents
+        phase_description = phase.description
 
-            try:
-                # 调用Flow系统执行Agent任务
-                flow_result = self._call_flow_agent(
-                    agent,
-                    f"{phase_description} - {agent}专项任务，项目背景：{project_context}"
-                )
-
-                agent_result.update({
-                    "status": "completed" if flow_result.get("success") else "failed",
-                    "result": flow_result,
-                    "end_time": datetime.now().isoformat(),
-                    "execution_time": time.time() - start_time
-                })
-
-            except Exception as e:
-                agent_result.update({
-                    "status": "error",
-                    "error": str(e),
-                    "end_time": datetime.now().isoformat(),
-                    "execution_time": time.time() - start_time
-                })
-
-            results.append(agent_result)
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(len(agents), 1)) as executor:
+            futures = [
+                executor.submit(self._run_phase_agent, agent, phase_name, phase_description, project_context)
+                for agent in agents
+            ]
+            # 按Agent顺序收集结果，总耗时取决于最慢的Agent
+            results = [future.result() for future in futures]
 
         return {
             "phase": phase_name,
             "results": results,
-            "total_time": time.time() - start_time,
+            "total_time": time.perf_counter() - start_time,
             "status": "completed"
         }
 
+    def _run_phase_agent(self, agent: str, phase_name: str, phase_description: str, project_context: str):
+        """执行阶段中的单个Agent任务"""
+        agent_result = {
+            "agent": agent,
+            "phase": phase_name,
+            "start_time": datetime.now().isoformat(),
+            "task": f"{phase_description} - {agent}专项任务",
+            "status": "running"
+        }
+        start_time = time.perf_counter()
+
+        try:
+            # 调用Flow系统执行Agent任务
+            flow_result = self._call_flow_agent(
+                agent,
+                f"{phase_description} - {agent}专项任务，项目背景：{project_context}"
+            )
+
+            agent_result.update({
+                "status": "completed" if flow_result.get("success") else "failed",
+                "result": flow_result,
+                "end_time": datetime.now().isoformat(),
+                "execution_time": time.perf_counter() - start_time
+            })
+
+        except Exception as e:
+            agent_result.update({
+                "status": "error",
+                "error": str(e),
+                "end_time": datetime.now().isoformat(),
+                "execution_time": time.perf_counter() - start_time
+            })
+
+        return agent_result
+
     def _call_flow_agent(self, agent_name: str, task: str):
         """调用Flow系统中的Agent"""
         try:
@@ -255,15 +344,16 @@ class AgentFlowExecutor:
                 [self.flow_bin_path, "agent", agent_name, task],
                 cwd=self.flow_project_path,
                 capture_output=True,
-                text=True,
                 timeout=300  # 5分钟超时
             )
 
-            return {
+            # 保持字节输出，仅在写入结果时解码；stderr只在失败时才需要
+            flow_result = {
                 "success": result.returncode == 0,
-                "output": result.stdout,
-                "error": result.stderr if result.returncode != 0 else None
+                "error": result.stderr.decode("utf-8", errors="replace") if result.returncode != 0 else None
             }
+            flow_result.update(self._store_agent_output(agent_name, result.stdout))
+            return flow_result
         except subprocess.TimeoutExpired:
             return {
                 "success": False,
@@ -275,6 +365,25 @@ class AgentFlowExecutor:
                 "error": f"执行异常: {str(e)}"
             }
 
+    def _store_agent_output(self, agent_name: str, output: bytes):
+        """小输出直接内联；大输出原样写入文件，结果中只保留预览和路径"""
+        if len(output) <= _INLINE_OUTPUT_LIMIT:
+            return {"output": output.decode("utf-8", errors="replace")}
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix=f"{agent_name}_", suffix=".out", dir=self.output_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(output)
+        except Exception:
+            return {"output": output.decode("utf-8", errors="replace")}
+
+        return {
+            "output": output[:_OUTPUT_PREVIEW_CHARS * 4].decode("utf-8", errors="ignore")[:_OUTPUT_PREVIEW_CHARS],
+            "output_file": path,
+            "output_size": len(output)
+        }
+
     def execute_workflow(self, workflow_type: str, project_description: str):
         """执行完整工作流"""
         workflow_id = f"workflow_{int(time.time())}"
@@ -290,13 +399,14 @@ class AgentFlowExecutor:
                 }
 
         workflow = self.workflows[workflow_type]
+        start_perf = time.perf_counter()
 
         # 初始化工作流状态
         workflow_state = {
             "workflow_id": workflow_id,
             "type": workflow_type,
-            "name": workflow["name"],
-            "description": workflow["description"],
+            "name": workflow.name,
+            "description": workflow.description,
             "project": project_description,
             "start_time": datetime.now().isoformat(),
             "status": "running",
@@ -305,31 +415,32 @@ class AgentFlowExecutor:
         }
 
         self.save_workflow_state(workflow_id, workflow_state)
+        self.flush_workflow_state()
 
         # 执行各个阶段
         all_results = []
 
-        for i, phase in enumerate(workflow["phases"]):
+        for i, phase in enumerate(workflow.phases):
             workflow_state["current_phase"] = i
-            self.save_workflow_state(workflow_id, workflow_state)
 
             phase_result = self.execute_phase(workflow_id, phase, project_description)
             all_results.append(phase_result)
 
-            workflow_state["phases_completed"].append(phase["name"])
+            workflow_state["phases_completed"].append(phase.name)
             self.save_workflow_state(workflow_id, workflow_state)
+            self.flush_workflow_state()
 
         # 完成工作流
         workflow_state.update({
             "status": "completed",
             "end_time": datetime.now().isoformat(),
-            "total_execution_time": time.time() - time.mktime(
-                datetime.fromisoformat(workflow_state["start_time"]).timetuple()
-            ),
+            "total_execution_time": time.perf_counter() - start_perf,
             "all_results": all_results
         })
 
         self.save_workflow_state(workflow_id, workflow_state)
+        self.flush_workflow_state()
+        self.compact()
 
         return {
             "success": True,
@@ -342,16 +453,9 @@ class AgentFlowExecutor:
 
     def _match_workflow_type(self, user_input: str):
         """智能匹配工作流类型"""
-        user_lower = user_input.lower()
-
-        if any(keyword in user_lower for keyword in ['开发', '系统', '软件', '应用']):
-            return "system_development"
-        elif any(keyword in user_lower for keyword in ['数据', '分析', '统计', '建模']):
-            return "data_analysis"
-        elif any(keyword in user_lower for keyword in ['安全', '审计', '漏洞', '合规']):
-            return "security_audit"
-        elif any(keyword in user_lower for keyword in ['运维', 'devops', '自动化', '部署']):
-            return "devops_automation"
+        matched = _matched_rule_indexes(user_input.lower())
+        if matched:
+            return _WORKFLOW_TYPE_RULES[min(matched)][1]
 
         return None
 
@@ -411,7 +515,10 @@ def main():
     elif action == "workflows":
         print(json.dumps({
             "available_workflows": list(executor.workflows.keys()),
-            "workflows": executor.workflows
+            "workflows": {
+                workflow_type: _workflow_as_dict(workflow)
+                for workflow_type, workflow in executor.workflows.items()
+            }
         }, ensure_ascii=False, indent=2))
 
     elif action == "state":
@@ -9,14 +9,60 @@ import sys
 import os
 import subprocess
 import re
+import time
 from pathlib import Path
 
+# 同目录的关键词匹配模块（以模块方式加载时脚本目录不在sys.path中）
+sys.path.insert(0, str(Path(__file__).parent))
+
+from keyword_rules import build_keyword_automaton, matched_rule_indexes
+
+# Agent请求匹配模式: 使用[agent名称]执行[任务]（模块加载时预编译）
+_AGENT_REQUEST_PATTERNS = tuple(re.compile(p) for p in (
+    r'使用\s*([a-zA-Z0-9\-]+)\s*(?:执行|进行|处理|分析|设计|开发|实现)\s*(.+)',
+    r'调用\s*([a-zA-Z0-9\-]+)\s*(?:执行|进行|处理|分析|设计|开发|实现)\s*(.+)',
+    r'让\s*([a-zA-Z0-9\-]+)\s*(?:执行|进行|处理|分析|设计|开发|实现)\s*(.+)'
+))
+
+# 任务关键词 → 推荐Agent 规则表
+_KEYWORD_RULES = (
+    (('python', 'code', '编程', '开发'), ('python-pro', 'web-developer')),
+    (('数据', '分析', '统计', '模型'), ('data-scientist', 'quant-analyst')),
+    (('安全', '审计', '漏洞', '防护'), ('security-auditor', 'penetration-tester')),
+    (('架构', '设计', '系统'), ('cloud-architect', 'backend-architect')),
+    (('测试', '质量', '验证'), ('test-automator', 'quality-assurance')),
+)
+
+# 单次最多推荐的Agent数量
+MAX_SUGGESTIONS = 6
+
+_KEYWORD_AUTOMATON = build_keyword_automaton(_KEYWORD_RULES)
+
+
+def _matched_rule_indexes(text):
+    """单次扫描text，返回命中的规则下标集合"""
+    return matched_rule_indexes(_KEYWORD_RULES, _KEYWORD_AUTOMATON, text)
+
+
+# Flow可用性检查结果的缓存时间（秒），失败结果缓存更短以便尽快重试
+FLOW_STATUS_TTL = 5.0
+FLOW_STATUS_NEGATIVE_TTL = 1.0
+
+
 class FlowConnector:
     def __init__(self):
         self.flow_bin_path = "/mnt/d/flow/bin/flow"
         self.flow_project_path = "/mnt/d/flow"
+        self._flow_ok_at = 0.0
+        self._flow_ok_cache = None
         self.available_agents = self._get_available_agents()
 
+        # Agent → 类别 反向索引（同名Agent保留首个类别）
+        self._agent_to_category = {}
+        for category, agents in self.available_agents.items():
+            for agent in agents:
+                self._agent_to_category.setdefault(agent, category)
+
     def _get_available_agents(self):
         """获取可用的Agent列表"""
         # 基于已知的83个专业Agent
@@ -64,48 +110,51 @@ class FlowConnector:
         }
 
     def is_flow_available(self):
-        """检查Flow系统是否可用"""
+        """检查Flow系统是否可用（结果短时缓存）"""
+        now = time.monotonic()
+        if self._flow_ok_cache is not None:
+            ttl = FLOW_STATUS_TTL if self._flow_ok_cache else FLOW_STATUS_NEGATIVE_TTL
+            if now - self._flow_ok_at < ttl:
+                return self._flow_ok_cache
+
+        self._flow_ok_cache = self._check_flow_available()
+        self._flow_ok_at = now
+        return self._flow_ok_cache
+
+    def _check_flow_available(self):
+        """实际检查Flow系统状态"""
         try:
-            result = subprocess.run(
-                [self.flow_bin_path, "status"],
-                cwd=self.flow_project_path,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
+            return self._run_flow("status", timeout=10).returncode == 0
         except Exception:
             return False
 
+    def _run_flow(self, *args, timeout):
+        """在Flow项目目录下执行 flow 子命令"""
+        return subprocess.run(
+            [self.flow_bin_path, *args],
+            cwd=self.flow_project_path,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+
     def find_agent_category(self, agent_name):
         """查找Agent所属类别"""
-        for category, agents in self.available_agents.items():
-            if agent_name in agents:
-                return category
-        return None
+        return self._agent_to_category.get(agent_name)
 
     def suggest_agents(self, task_description):
         """根据任务描述推荐合适的Agent"""
         task_lower = task_description.lower()
-        suggestions = []
+        seen = {}  # 用dict做保序去重集合
 
-        # 基于关键词匹配推荐Agent
-        if any(keyword in task_lower for keyword in ['python', 'code', '编程', '开发']):
-            suggestions.extend(['python-pro', 'web-developer'])
+        # 基于关键词匹配推荐Agent（按规则顺序输出，够数即停）
+        for index in sorted(_matched_rule_indexes(task_lower)):
+            for agent in _KEYWORD_RULES[index][1]:
+                seen[agent] = None
+            if len(seen) >= MAX_SUGGESTIONS:
+                break
 
-        if any(keyword in task_lower for keyword in ['数据', '分析', '统计', '模型']):
-            suggestions.extend(['data-scientist', 'quant-analyst'])
-
-        if any(keyword in task_lower for keyword in ['安全', '审计', '漏洞', '防护']):
-            suggestions.extend(['security-auditor', 'penetration-tester'])
-
-        if any(keyword in task_lower for keyword in ['架构', '设计', '系统']):
-            suggestions.extend(['cloud-architect', 'backend-architect'])
-
-        if any(keyword in task_lower for keyword in ['测试', '质量', '验证']):
-            suggestions.extend(['test-automator', 'quality-assurance'])
-
-        return list(set(suggestions))  # 去重
+        return list(seen)[:MAX_SUGGESTIONS]
 
     def call_agent(self, agent_name, task):
         """调用指定的Agent执行任务"""
@@ -125,16 +174,7 @@ class FlowConnector:
             }
 
         try:
-            # 构建Flow命令
-            flow_command = f'agent {agent_name} "{task}"'
-
-            result = subprocess.run(
-                [self.flow_bin_path, "agent", agent_name, task],
-                cwd=self.flow_project_path,
-                capture_output=True,
-                text=True,
-                timeout=120  # 2分钟超时
-            )
+            result = self._run_flow("agent", agent_name, task, timeout=120)  # 2分钟超时
 
             if result.returncode == 0:
                 return {
@@ -174,15 +214,8 @@ class FlowConnector:
 
     def parse_agent_request(self, user_input):
         """解析用户输入中的Agent请求"""
-        # 匹配模式: 使用[agent名称]执行[任务]
-        patterns = [
-            r'使用\s*([a-zA-Z0-9\-]+)\s*(?:执行|进行|处理|分析|设计|开发|实现)\s*(.+)',
-            r'调用\s*([a-zA-Z0-9\-]+)\s*(?:执行|进行|处理|分析|设计|开发|实现)\s*(.+)',
-            r'让\s*([a-zA-Z0-9\-]+)\s*(?:执行|进行|处理|分析|设计|开发|实现)\s*(.+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, user_input)
+        for pattern in _AGENT_REQUEST_PATTERNS:
+            match = pattern.search(user_input)
             if match:
                 agent_name = match.group(1)
                 task = match.group(2)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+关键词规则匹配
+(关键词元组, 结果) 规则表匹配工具，安装了pyahocorasick时单次扫描完成
+"""
+
+try:
+    import ahocorasick  # pyahocorasick，可选依赖
+except ImportError:
+    ahocorasick = None
+
+
+def build_keyword_automaton(rules):
+    """把关键词规则编译为Aho-Corasick自动机，值为命中的规则下标；未安装pyahocorasick时返回None"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for index, (keywords, _) in enumerate(rules):
+        for keyword in keywords:
+            automaton.add_word(keyword, automaton.get(keyword, ()) + (index,))
+    automaton.make_automaton()
+    return automaton
+
+
+def matched_rule_indexes(rules, automaton, text):
+    """单次扫描text，返回命中的规则下标集合；automaton为None时逐条检查关键词"""
+    if automaton is not None:
+        return {index for _, indexes in automaton.iter(text) for index in indexes}
+    return {
+        index for index, (keywords, _) in enumerate(rules)
+        if any(keyword in text for keyword in keywords)
+    }
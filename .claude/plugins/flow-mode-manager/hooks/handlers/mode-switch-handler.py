@@ -9,47 +9,102 @@ import os
 import sys
 from pathlib import Path
 
+try:
+    import orjson  # 可选依赖，JSON编解码更快
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj, indent=False) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+else:
+    _loads = json.loads
+
+    def _dumps(obj, indent=False) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+# 状态文件路径（导入时计算一次）
+_STATE_FILE = os.path.expanduser("~/.claude/flow_mode_state.json")
+_STATE_DIR = os.path.dirname(_STATE_FILE)
+
+# 本进程内状态目录是否已确认存在
+_state_dir_ready = False
+
+
+def _ensure_state_dir():
+    """每个进程只创建一次状态目录"""
+    global _state_dir_ready
+    if not _state_dir_ready:
+        os.makedirs(_STATE_DIR, exist_ok=True)
+        _state_dir_ready = True
+
 class FlowModeManager:
+    __slots__ = ("state_file", "_cached_mode", "_cached_mtime")
+
+    MODES = ("flow", "agentflow", "fusion")
+    MODE_ICONS = {
+        "flow": "🎯",
+        "agentflow": "🔗",
+        "fusion": "🚀"
+    }
+    MODE_NAMES = {
+        "flow": "Flow Mode",
+        "agentflow": "AgentFlow Mode",
+        "fusion": "Fusion Mode"
+    }
+    # 模式 → 显示前缀，如 "[🎯 Flow Mode]"（MODE_ICONS 与 MODE_NAMES 键顺序一致）
+    _PREFIX = {
+        mode: f"[{icon} {name}]"
+        for (mode, icon), name in zip(MODE_ICONS.items(), MODE_NAMES.values())
+    }
+    _UNKNOWN_ICON = "📋"
+    _UNKNOWN_NAME = "Unknown Mode"
+    _UNKNOWN_PREFIX = f"[{_UNKNOWN_ICON} {_UNKNOWN_NAME}]"
+    # 模式 → 下一个模式（顺序循环）
+    _NEXT_MODE = dict(zip(MODES, MODES[1:] + MODES[:1]))
+
     def __init__(self):
-        self.modes = ["flow", "agentflow", "fusion"]
-        self.mode_icons = {
-            "flow": "🎯",
-            "agentflow": "🔗",
-            "fusion": "🚀"
-        }
-        self.mode_names = {
-            "flow": "Flow Mode",
-            "agentflow": "AgentFlow Mode",
-            "fusion": "Fusion Mode"
-        }
-        self.state_file = os.path.expanduser("~/.claude/flow_mode_state.json")
+        self.state_file = _STATE_FILE
+        # 状态文件缓存：文件mtime未变化时直接返回缓存的模式
+        self._cached_mode = None
+        self._cached_mtime = None
 
     def get_current_mode(self):
         """获取当前模式"""
         try:
-            if os.path.exists(self.state_file):
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('current_mode', 'flow')
+            mtime = os.stat(self.state_file).st_mtime_ns
+        except OSError:
             return 'flow'
+
+        if self._cached_mode is not None and mtime == self._cached_mtime:
+            return self._cached_mode
+
+        try:
+            with open(self.state_file, 'r') as f:
+                data = _loads(f.read())
+            self._cached_mode = data.get('current_mode', 'flow')
+            self._cached_mtime = mtime
+            return self._cached_mode
         except Exception:
             return 'flow'
 
     def set_current_mode(self, mode):
-        """设置当前模式"""
+        """设置当前模式（先写临时文件再原子替换，中途失败不会留下半个状态文件）"""
         try:
-            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-            with open(self.state_file, 'w') as f:
-                json.dump({'current_mode': mode}, f)
+            _ensure_state_dir()
+            tmp_file = self.state_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(_dumps({'current_mode': mode}))
+            os.replace(tmp_file, self.state_file)
             return True
         except Exception:
             return False
 
     def get_next_mode(self, current_mode):
         """获取下一个模式（顺序切换）"""
-        current_index = self.modes.index(current_mode) if current_mode in self.modes else 0
-        next_index = (current_index + 1) % len(self.modes)
-        return self.modes[next_index]
+        return self._NEXT_MODE.get(current_mode, self.MODES[1])
 
     def switch_mode(self, target_mode=None):
         """切换模式"""
@@ -57,7 +112,7 @@ class FlowModeManager:
 
         if target_mode:
             # 切换到指定模式
-            if target_mode in self.modes:
+            if target_mode in self.MODES:
                 new_mode = target_mode
             else:
                 return self.create_response(current_mode, "无效的模式名称")
@@ -67,21 +122,29 @@ class FlowModeManager:
 
         # 保存新模式
         if self.set_current_mode(new_mode):
-            return self.create_response(new_mode, f"已切换到{self.mode_names[new_mode]}")
+            return self.create_response(new_mode, f"已切换到{self.MODE_NAMES[new_mode]}")
         else:
             return self.create_response(current_mode, "模式切换失败")
 
     def create_response(self, mode, message):
         """创建模式标识响应"""
-        icon = self.mode_icons.get(mode, "📋")
-        name = self.mode_names.get(mode, "Unknown Mode")
+        prefix = self._PREFIX.get(mode)
+        if prefix is None:
+            return {
+                "hookSpecificOutput": {
+                    "additionalContext": f"{self._UNKNOWN_PREFIX} {message}",
+                    "mode": mode,
+                    "icon": self._UNKNOWN_ICON,
+                    "name": self._UNKNOWN_NAME
+                }
+            }
 
         return {
             "hookSpecificOutput": {
-                "additionalContext": f"[{icon} {name}] {message}",
+                "additionalContext": f"{prefix} {message}",
                 "mode": mode,
-                "icon": icon,
-                "name": name
+                "icon": self.MODE_ICONS[mode],
+                "name": self.MODE_NAMES[mode]
             }
         }
 
@@ -101,17 +164,15 @@ def main():
     if action == "switch":
         target_mode = sys.argv[2] if len(sys.argv) > 2 else None
         result = manager.switch_mode(target_mode)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(_dumps(result, indent=True))
     elif action == "get":
         mode = manager.get_current_mode()
-        icon = manager.mode_icons.get(mode, "📋")
-        name = manager.mode_names.get(mode, "Unknown Mode")
-        print(json.dumps({
+        print(_dumps({
             "mode": mode,
-            "icon": icon,
-            "name": name,
-            "display": f"[{icon} {name}]"
-        }, ensure_ascii=False, indent=2))
+            "icon": manager.MODE_ICONS.get(mode, manager._UNKNOWN_ICON),
+            "name": manager.MODE_NAMES.get(mode, manager._UNKNOWN_NAME),
+            "display": manager._PREFIX.get(mode, manager._UNKNOWN_PREFIX)
+        }, indent=True))
     else:
         print(json.dumps({"error": "未知操作"}))
 
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+智能Flow常驻进程
+在UNIX socket上常驻FlowHandler，避免每条 /flow 命令重复导入模块和加载开发者档案
+
+启动：python3 flow_daemon.py
+flow_handler.py 检测到socket可连接时会自动把命令转发到这里执行
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from flow_handler import FlowHandler, FLOW_DAEMON_SOCKET
+
+# 空闲超过该秒数后常驻进程自动退出
+_IDLE_TIMEOUT = 30 * 60
+
+
+class _FlowRequestHandler(socketserver.StreamRequestHandler):
+    """处理单条命令：读取一行JSON参数，返回命令的标准输出"""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return  # 仅探测连接
+
+        try:
+            request = json.loads(line.decode("utf-8"))
+            output = self.server.run_command(request.get("args", []))
+        except Exception:
+            output = traceback.format_exc()
+        self.wfile.write(output.encode("utf-8"))
+
+
+class FlowDaemon(socketserver.UnixStreamServer):
+    """单线程串行处理命令（redirect_stdout 为进程级，不能并发）"""
+
+    timeout = _IDLE_TIMEOUT
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.idle = False
+        self._handler = None
+        self._data_signature = None
+        super().__init__(socket_path, _FlowRequestHandler)
+
+    def handle_timeout(self):
+        self.idle = True
+
+    def _current_data_signature(self, data_dir: Path):
+        """数据目录下各文件的mtime，用于发现其他进程（如Hook）写入的数据"""
+        try:
+            return tuple(sorted(
+                (entry.name, entry.stat().st_mtime_ns)
+                for entry in os.scandir(data_dir) if entry.is_file()
+            ))
+        except OSError:
+            return None
+
+    def _get_handler(self) -> FlowHandler:
+        """复用FlowHandler；数据文件被外部修改时重新加载"""
+        if self._handler is not None:
+            signature = self._current_data_signature(self._handler.plugin_root / "data")
+            if signature == self._data_signature:
+                return self._handler
+
+        self._handler = FlowHandler()
+        return self._handler
+
+    def run_command(self, args) -> str:
+        handler = self._get_handler()
+        handler.reset_session()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            try:
+                handler.handle_command(args)
+            except Exception:
+                traceback.print_exc(file=output)
+        # 记录本次命令写入后的状态，自身的写入不触发重新加载
+        self._data_signature = self._current_data_signature(handler.plugin_root / "data")
+        return output.getvalue()
+
+
+def _is_running(socket_path: str) -> bool:
+    """socket可连接即认为已有常驻进程"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+def main():
+    """主函数"""
+    socket_path = FLOW_DAEMON_SOCKET
+    if _is_running(socket_path):
+        print("Flow常驻进程已在运行")
+        return
+
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    try:
+        os.unlink(socket_path)  # 清理上次遗留的socket文件
+    except FileNotFoundError:
+        pass
+
+    with FlowDaemon(socket_path) as server:
+        try:
+            while not server.idle:
+                server.handle_request()
+        finally:
+            try:
+                os.unlink(socket_path)
+            except FileNotFoundError:
+                pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,26 +8,135 @@ import sys
 import os
 import json
 import argparse
+import re
+import socket
+import time
 from pathlib import Path
-from datetime import datetime
 
-# 添加核心模块路径
+# 添加核心模块路径（intelligent_engine 在首次使用时才导入，help等命令无需加载）
 sys.path.insert(0, str(Path(__file__).parent.parent / "core"))
 
-from intelligent_engine import IntelligentEngine, WorkflowStage, ProjectType
+# Flow常驻进程（flow_daemon.py）的UNIX socket路径
+FLOW_DAEMON_SOCKET = os.environ.get("FLOW_DAEMON_SOCKET", os.path.expanduser("~/.claude/flow.sock"))
+
+# 等待常驻进程返回结果的超时秒数
+_DAEMON_TIMEOUT = 30
+
+# 本进程内模板目录是否已确认存在
+_templates_dir_checked = False
+
+# 需要终端交互输入的命令，始终在本进程执行
+_INTERACTIVE_COMMANDS = {"363"}
+
+# 意图关键词 → 处理方法（按优先级排列）
+_INTENT_RULES = (
+    (("状态", "进度", "当前"), "_show_status"),
+    (("建议", "推荐", "优化"), "_handle_learning"),
+    (("继续", "恢复"), "_resume_workflow"),
+)
+_INTENT_BY_KEYWORD = {
+    keyword: index
+    for index, (keywords, _) in enumerate(_INTENT_RULES)
+    for keyword in keywords
+}
+# 所有关键词编译为单个正则，一次扫描找出全部命中
+_INTENT_PATTERN = re.compile("|".join(map(re.escape, _INTENT_BY_KEYWORD)))
+
+
+# 默认需求模板（templates/requirement_template.md 不存在时使用）
+_DEFAULT_REQUIREMENT_TEMPLATE = """# 项目需求模板
+
+## 🎯 项目概述
+- **项目名称**：[项目名称]
+- **项目类型**：[Web应用/CLI工具/API服务等]
+- **核心目标**：[主要解决的问题]
+
+## 📋 核心功能
+1. **[功能1]** - [详细描述]
+2. **[功能2]** - [详细描述]
+3. **[功能3]** - [详细描述]
+
+## 💻 技术要求
+- **编程语言**：[首选技术栈]
+- **框架要求**：[特定框架或库]
+- **部署环境**：[运行环境要求]
+
+## 🔧 技术约束
+- **性能要求**：[响应时间、并发等]
+- **安全要求**：[数据保护、权限控制等]
+- **兼容性要求**：[平台、浏览器等]
+
+## 📊 验收标准
+- [ ] 功能完整性
+- [ ] 性能指标
+- [ ] 安全检查
+- [ ] 兼容性测试
+"""
+
+
+def _workflow_stage():
+    """工作流阶段枚举（与引擎一样在首次使用时才导入）"""
+    from intelligent_engine import WorkflowStage
+    return WorkflowStage
 
 
 class FlowHandler:
     """Flow命令处理器"""
 
+    __slots__ = ("plugin_root", "_engine", "templates_dir", "_status_cache")
+
+    # 模板文件路径 → (mtime, 内容)
+    _template_cache = {}
+
     def __init__(self):
         self.plugin_root = Path(__file__).parent.parent
-        self.engine = IntelligentEngine(str(self.plugin_root))
+        self._engine = None
+        self._status_cache = None
         self.templates_dir = self.plugin_root / "templates"
-        self.templates_dir.mkdir(exist_ok=True)
+        self._ensure_templates_dir()
+
+    def _ensure_templates_dir(self):
+        """每个进程只创建一次模板目录"""
+        global _templates_dir_checked
+        if _templates_dir_checked:
+            return
+        try:
+            self.templates_dir.mkdir()
+        except FileExistsError:
+            pass
+        _templates_dir_checked = True
+
+    @property
+    def engine(self):
+        """智能引擎（首次访问时导入并加载学习数据）"""
+        if self._engine is None:
+            from intelligent_engine import IntelligentEngine
+            self._engine = IntelligentEngine(str(self.plugin_root))
+        return self._engine
 
     def handle_command(self, args):
-        """处理Flow命令"""
+        """处理Flow命令（工作流状态在单条命令内只计算一次，命令结束时保存学习数据）"""
+        self._status_cache = None
+        try:
+            self._dispatch_command(args)
+        finally:
+            self._status_cache = None
+            if self._engine is not None:
+                self._engine.flush()
+
+    def reset_session(self):
+        """清除上一条命令遗留的项目上下文（常驻进程复用本对象时，每条命令前调用）"""
+        if self._engine is not None:
+            self._engine.current_context = None
+
+    def _get_status(self) -> dict:
+        """获取本条命令内缓存的工作流状态"""
+        if self._status_cache is None:
+            self._status_cache = self.engine.get_workflow_status()
+        return self._status_cache
+
+    def _dispatch_command(self, args):
+        """按命令分发处理"""
         if not args or args == []:
             self._show_available_flows()
             return
@@ -54,45 +163,57 @@ class FlowHandler:
 
     def _show_available_flows(self):
         """显示可用的Flow"""
-        print("🧠 智能Flow工作流系统")
-        print("=" * 50)
+        lines = [
+            "🧠 智能Flow工作流系统",
+            "=" * 50,
+        ]
 
         # 获取当前状态
-        status = self.engine.get_workflow_status()
+        status = self._get_status()
 
         if status["status"] == "active":
-            print(f"🔄 当前项目：{status['project_type']}")
-            print(f"📊 当前进度：{status['progress']*100:.0f}%")
-            print(f"⏱️ 已用时间：{status['elapsed_time']:.0f}分钟")
-            print(f"🎯 预估时间：{status['estimated_time']}分钟")
-            print()
-
-        print("🚀 可用工作流：")
-        print("  /flow 363              - 经典3-6-3工作流")
-        print("  /flow 363-dev          - 智能项目开发流程")
-        print("  /flow 363-requirement  - 专注需求拆解阶段")
-        print("  /flow 363-implementation - 专注代码生成阶段")
-        print("  /flow 363-testing      - 专注验收迭代阶段")
-        print()
-
-        print("🧠 智能工作流：")
-        print("  /flow smart [描述]     - AI自动选择最佳流程")
-        print("  /flow adaptive [描述]  - 个性化自适应流程")
-        print()
-
-        print("📊 学习和分析：")
-        print("  /flow profile          - 查看开发者学习档案")
-        print("  /flow learn            - 获取学习和优化建议")
-        print()
+            lines += [
+                f"🔄 当前项目：{status['project_type']}",
+                f"📊 当前进度：{status['progress']*100:.0f}%",
+                f"⏱️ 已用时间：{status['elapsed_time']:.0f}分钟",
+                f"🎯 预估时间：{status['estimated_time']}分钟",
+                "",
+            ]
+
+        lines += [
+            "🚀 可用工作流：",
+            "  /flow 363              - 经典3-6-3工作流",
+            "  /flow 363-dev          - 智能项目开发流程",
+            "  /flow 363-requirement  - 专注需求拆解阶段",
+            "  /flow 363-implementation - 专注代码生成阶段",
+            "  /flow 363-testing      - 专注验收迭代阶段",
+            "",
+        ]
+
+        lines += [
+            "🧠 智能工作流：",
+            "  /flow smart [描述]     - AI自动选择最佳流程",
+            "  /flow adaptive [描述]  - 个性化自适应流程",
+            "",
+        ]
+
+        lines += [
+            "📊 学习和分析：",
+            "  /flow profile          - 查看开发者学习档案",
+            "  /flow learn            - 获取学习和优化建议",
+            "",
+        ]
 
         # 智能推荐
         if status["status"] != "active":
             recommendations = self._get_smart_recommendations()
             if recommendations:
-                print("💡 AI推荐：")
+                lines.append("💡 AI推荐：")
                 for rec in recommendations:
-                    print(f"  • {rec}")
-                print()
+                    lines.append(f"  • {rec}")
+                lines.append("")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def _handle_363_workflow(self, subcommand, args):
         """处理3-6-3工作流"""
@@ -110,7 +231,20 @@ class FlowHandler:
 
     def _start_intelligent_363_dev(self, args):
         """启动智能3-6-3项目开发流程"""
-        description = " ".join(args) if args else input("📝 请描述您的项目需求：")
+        parser = argparse.ArgumentParser(prog="/flow 363 dev", add_help=False)
+        parser.add_argument("--description", "-d")
+        parser.add_argument("--yes", "-y", action="store_true")
+        options, rest = parser.parse_known_args(args)
+
+        # 无终端时（脚本/管道批量调用）默认确认启动
+        assume_yes = options.yes or not sys.stdin.isatty()
+
+        description = options.description or " ".join(rest)
+        if not description:
+            try:
+                description = input("📝 请描述您的项目需求：")
+            except EOFError:
+                description = ""
 
         if not description.strip():
             print("❌ 项目描述不能为空")
@@ -119,7 +253,7 @@ class FlowHandler:
         print("\n🧠 智能分析中...")
         context = self.engine.start_project(description)
 
-        print(f"\n✅ 检测到项目类型：{context.project_type.value}")
+        print(f"\n✅ 检测到项目类型：{context.type_key}")
         print(f"📊 复杂度评估：{context.complexity}")
         print(f"⏱️ 预估开发时间：{context.estimated_time}分钟")
         print(f"🛠️ 推荐技术栈：{', '.join(context.tech_stack)}")
@@ -135,7 +269,7 @@ class FlowHandler:
                 print(f"  • {rec}")
 
         print(f"\n🚀 是否启动为您优化的3-6-3开发流程？[Y/n]")
-        response = input().strip().lower()
+        response = "" if assume_yes else input().strip().lower()
 
         if response in ['', 'y', 'yes']:
             self._execute_363_workflow(context)
@@ -161,58 +295,80 @@ class FlowHandler:
 
     def _execute_requirement_phase(self, context):
         """执行需求拆解阶段"""
-        print(f"\n📋 第一阶段：需求拆解（25分钟）")
-        print("-" * 30)
+        lines = [
+            f"\n📋 第一阶段：需求拆解（25分钟）",
+            "-" * 30,
+        ]
 
         # 动作1：需求清晰描述
-        print("\n1️⃣ 需求清晰描述")
+        lines.append("\n1️⃣ 需求清晰描述")
         requirement_template = self._load_requirement_template()
-        print("📋 已为您准备需求模板：")
-        print(requirement_template)
+        lines += [
+            "📋 已为您准备需求模板：",
+            requirement_template,
+        ]
 
         # 动作2：补充详细文档
-        print("\n2️⃣ AI补充详细文档")
-        print("🤖 基于您的需求，AI将补充：")
-        print("  • 详细的技术架构设计")
-        print("  • 完整的功能规格说明")
-        print("  • 具体的实现方案")
-        print("  • 开发计划和里程碑")
+        lines += [
+            "\n2️⃣ AI补充详细文档",
+            "🤖 基于您的需求，AI将补充：",
+            "  • 详细的技术架构设计",
+            "  • 完整的功能规格说明",
+            "  • 具体的实现方案",
+            "  • 开发计划和里程碑",
+        ]
 
         # 动作3：清空上下文
-        print("\n3️⃣ 清空上下文环境")
-        print("🔄 准备专注于代码生成...")
+        lines += [
+            "\n3️⃣ 清空上下文环境",
+            "🔄 准备专注于代码生成...",
+        ]
 
-        context.current_stage = WorkflowStage.REQUIREMENT
-        print("✅ 需求拆解阶段完成")
+        context.current_stage = _workflow_stage().REQUIREMENT
+        lines.append("✅ 需求拆解阶段完成")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def _execute_implementation_phase(self, context):
         """执行代码生成阶段"""
-        print(f"\n💻 第二阶段：代码生成（45分钟）")
-        print("-" * 30)
+        lines = [
+            f"\n💻 第二阶段：代码生成（45分钟）",
+            "-" * 30,
+        ]
 
         # 动作4：严格生成
-        print("\n4️⃣ 严格按照需求文档生成")
-        print("🔧 基于详细需求文档生成：")
-        print("  • 完整的项目源代码")
-        print("  • 项目结构和配置文件")
-        print("  • 使用说明和部署指南")
-        print("  • 测试用例和API文档")
+        lines += [
+            "\n4️⃣ 严格按照需求文档生成",
+            "🔧 基于详细需求文档生成：",
+            "  • 完整的项目源代码",
+            "  • 项目结构和配置文件",
+            "  • 使用说明和部署指南",
+            "  • 测试用例和API文档",
+        ]
 
         # 动作5：专注执行
-        print("\n5️⃣ 专注代码实现")
-        print("⚡ 保持架构一致性，确保代码质量标准")
+        lines += [
+            "\n5️⃣ 专注代码实现",
+            "⚡ 保持架构一致性，确保代码质量标准",
+        ]
 
-        context.current_stage = WorkflowStage.IMPLEMENTATION
-        print("✅ 代码生成阶段完成")
+        context.current_stage = _workflow_stage().IMPLEMENTATION
+        lines.append("✅ 代码生成阶段完成")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def _execute_testing_phase(self, context):
         """执行验收迭代阶段"""
-        print(f"\n🔍 第三阶段：验收迭代（40分钟）")
-        print("-" * 30)
+        lines = [
+            f"\n🔍 第三阶段：验收迭代（40分钟）",
+            "-" * 30,
+        ]
 
         # 动作6：集中测试
-        print("\n6️⃣ 集中验收测试")
-        print("🧪 全面测试验证：")
+        lines += [
+            "\n6️⃣ 集中验收测试",
+            "🧪 全面测试验证：",
+        ]
         test_items = [
             "功能完整性测试",
             "性能指标验证",
@@ -220,38 +376,47 @@ class FlowHandler:
             "兼容性测试"
         ]
         for item in test_items:
-            print(f"  ✓ {item}")
+            lines.append(f"  ✓ {item}")
 
         # 动作7：批量修复
-        print("\n7️⃣ 批量问题修复")
-        print("🔧 记录所有发现问题，一次性修复，避免零散修改")
+        lines += [
+            "\n7️⃣ 批量问题修复",
+            "🔧 记录所有发现问题，一次性修复，避免零散修改",
+        ]
+
+        context.current_stage = _workflow_stage().TESTING
+        lines.append("✅ 验收迭代阶段完成")
 
-        context.current_stage = WorkflowStage.TESTING
-        print("✅ 验收迭代阶段完成")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def _complete_workflow(self, context):
         """完成工作流"""
-        context.current_stage = WorkflowStage.COMPLETED
-        context.last_activity = datetime.now()
+        completed = _workflow_stage().COMPLETED
+        context.current_stage = completed
+        context.last_activity = time.time()
 
         # 记录学习数据
         feedback = {
             "satisfaction": 5,  # 默认满意度
             "completed": True,
-            "final_time": (context.last_activity - context.start_time).total_seconds() / 60
+            "final_time": (context.last_activity - context.start_time) / 60
         }
-        self.engine.update_learning_data(context, WorkflowStage.COMPLETED, feedback)
-
-        print(f"\n🎉 项目完成！")
-        print("=" * 50)
-        print(f"📊 项目统计：")
-        print(f"  • 项目类型：{context.project_type.value}")
-        print(f"  • 实际用时：{feedback['final_time']:.0f}分钟")
-        print(f"  • 预估用时：{context.estimated_time}分钟")
-        print(f"  • 技术栈：{', '.join(context.tech_stack)}")
+        self.engine.update_learning_data(context, completed, feedback)
+
+        lines = [
+            f"\n🎉 项目完成！",
+            "=" * 50,
+            f"📊 项目统计：",
+            f"  • 项目类型：{context.type_key}",
+            f"  • 实际用时：{feedback['final_time']:.0f}分钟",
+            f"  • 预估用时：{context.estimated_time}分钟",
+            f"  • 技术栈：{', '.join(context.tech_stack)}",
+        ]
 
         # 更新学习数据
-        print(f"\n🧠 已更新您的开发模式学习数据")
+        lines.append(f"\n🧠 已更新您的开发模式学习数据")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def _handle_smart_flow(self, args):
         """处理智能Flow"""
@@ -339,55 +504,42 @@ class FlowHandler:
 
     def _intelligent_parse(self, args):
         """智能解析用户意图"""
-        query = " ".join(args).lower()
-
-        # 意图识别
-        if any(word in query for word in ["状态", "进度", "当前"]):
-            self._show_status()
-        elif any(word in query for word in ["建议", "推荐", "优化"]):
-            self._handle_learning()
-        elif any(word in query for word in ["继续", "恢复"]):
-            self._resume_workflow()
+        # 意图识别：逐个参数扫描，不拼接整条查询；多个意图命中时按规则优先级选择
+        matched = None
+        for arg in args:
+            for word in _INTENT_PATTERN.findall(arg.lower()):
+                index = _INTENT_BY_KEYWORD[word]
+                if matched is None or index < matched:
+                    matched = index
+            if matched == 0:
+                break  # 已命中最高优先级意图
+
+        if matched is not None:
+            getattr(self, _INTENT_RULES[matched][1])()
         else:
             # 默认启动智能流程
             self._handle_smart_flow(args)
 
     def _load_requirement_template(self) -> str:
-        """加载需求模板"""
+        """加载需求模板（按文件mtime缓存）"""
         template_file = self.templates_dir / "requirement_template.md"
-        if template_file.exists():
-            with open(template_file, 'r', encoding='utf-8') as f:
-                return f.read()
-
-        # 返回默认模板
-        return """# 项目需求模板
-
-## 🎯 项目概述
-- **项目名称**：[项目名称]
-- **项目类型**：[Web应用/CLI工具/API服务等]
-- **核心目标**：[主要解决的问题]
+        try:
+            mtime = os.stat(template_file).st_mtime_ns
+        except FileNotFoundError:
+            return _DEFAULT_REQUIREMENT_TEMPLATE
 
-## 📋 核心功能
-1. **[功能1]** - [详细描述]
-2. **[功能2]** - [详细描述]
-3. **[功能3]** - [详细描述]
+        cached = self._template_cache.get(template_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
 
-## 💻 技术要求
-- **编程语言**：[首选技术栈]
-- **框架要求**：[特定框架或库]
-- **部署环境**：[运行环境要求]
-
-## 🔧 技术约束
-- **性能要求**：[响应时间、并发等]
-- **安全要求**：[数据保护、权限控制等]
-- **兼容性要求**：[平台、浏览器等]
+        try:
+            with open(template_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return _DEFAULT_REQUIREMENT_TEMPLATE
 
-## 📊 验收标准
-- [ ] 功能完整性
-- [ ] 性能指标
-- [ ] 安全检查
-- [ ] 兼容性测试
-"""
+        self._template_cache[template_file] = (mtime, content)
+        return content
 
     def _show_developer_profile(self):
         """显示开发者档案"""
@@ -395,12 +547,10 @@ class FlowHandler:
 
         # 项目统计
         print(f"📈 项目统计：")
-        total_projects = sum(data.get("frequency", 0) for data in profile.project_preferences.values())
-        print(f"  • 总项目数：{total_projects}")
+        print(f"  • 总项目数：{self.engine.get_total_projects()}")
 
-        if profile.project_preferences:
-            favorite_type = max(profile.project_preferences.items(),
-                              key=lambda x: x[1].get("frequency", 0))
+        favorite_type = self.engine.get_favorite_project_type()
+        if favorite_type:
             print(f"  • 最擅长的项目类型：{favorite_type[0]}")
 
         # 技术栈偏好
@@ -425,7 +575,7 @@ class FlowHandler:
         profile = self.engine.profile
 
         # 基于项目数量建议
-        total_projects = sum(data.get("frequency", 0) for data in profile.project_preferences.values())
+        total_projects = self.engine.get_total_projects()
 
         if total_projects < 3:
             recommendations.append("多尝试不同类型的项目，AI会更好地了解您的偏好")
@@ -447,7 +597,7 @@ class FlowHandler:
 
     def _show_status(self):
         """显示当前状态"""
-        status = self.engine.get_workflow_status()
+        status = self._get_status()
 
         if status["status"] == "no_active_project":
             print("🔄 当前无活跃项目")
@@ -462,16 +612,13 @@ class FlowHandler:
         """获取智能推荐"""
         recommendations = []
 
-        # 基于历史项目推荐
-        if self.engine.profile.project_preferences:
-            # 找出最常见的项目类型
-            most_common = max(self.engine.profile.project_preferences.items(),
-                            key=lambda x: x[1].get("frequency", 0))
-            if most_common[1].get("frequency", 0) > 2:
-                recommendations.append(f"您最擅长{most_common[0]}类项目，可以尝试进阶功能")
+        # 基于历史项目推荐：找出最常见的项目类型
+        most_common = self.engine.get_favorite_project_type()
+        if most_common and most_common[1].get("frequency", 0) > 2:
+            recommendations.append(f"您最擅长{most_common[0]}类项目，可以尝试进阶功能")
 
         # 基于当前时间推荐
-        current_hour = datetime.now().hour
+        current_hour = time.localtime().tm_hour
         if 9 <= current_hour <= 11:
             recommendations.append("上午适合需求分析和架构设计")
         elif 14 <= current_hour <= 16:
@@ -484,7 +631,7 @@ class FlowHandler:
     def _apply_personalization(self, context):
         """应用个性化设置"""
         profile = self.engine.profile
-        type_key = context.project_type.value
+        type_key = context.type_key
 
         # 应用学习到的优化
         if type_key in profile.learned_optimizations:
@@ -508,30 +655,71 @@ class FlowHandler:
 
     def _show_help(self):
         """显示帮助信息"""
-        print("🧠 智能Flow工作流系统 - 帮助")
-        print("=" * 50)
-        print("基本用法：")
-        print("  /flow                    - 显示可用工作流")
-        print("  /flow 363               - 启动经典3-6-3工作流")
-        print("  /flow smart [描述]      - AI智能选择流程")
-        print("  /flow adaptive [描述]   - 个性化自适应流程")
-        print("\n学习功能：")
-        print("  /flow profile          - 查看开发者档案")
-        print("  /flow learn            - 获取学习建议")
-        print("\n更多帮助：")
-        print("  系统会自动学习您的开发模式")
-        print("  越用越懂您，提供个性化建议")
+        lines = [
+            "🧠 智能Flow工作流系统 - 帮助",
+            "=" * 50,
+            "基本用法：",
+            "  /flow                    - 显示可用工作流",
+            "  /flow 363               - 启动经典3-6-3工作流",
+            "  /flow smart [描述]      - AI智能选择流程",
+            "  /flow adaptive [描述]   - 个性化自适应流程",
+            "\n学习功能：",
+            "  /flow profile          - 查看开发者档案",
+            "  /flow learn            - 获取学习建议",
+            "\n更多帮助：",
+            "  系统会自动学习您的开发模式",
+            "  越用越懂您，提供个性化建议",
+        ]
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _daemon_output(args):
+    """把命令转发给常驻进程执行，返回其输出；无法连接常驻进程时返回None
+
+    请求发出后出错（超时、连接中断）抛出OSError，由调用方报告，
+    不能再回退到本进程执行，否则命令可能被执行两次
+    """
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    except (AttributeError, OSError):
+        return None
+
+    with sock:
+        sock.settimeout(_DAEMON_TIMEOUT)
+        try:
+            sock.connect(FLOW_DAEMON_SOCKET)
+        except OSError:
+            return None
+
+        sock.sendall(json.dumps({"args": args}, ensure_ascii=False).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    return b"".join(chunks).decode("utf-8")
 
 
 def main():
     """主函数"""
-    handler = FlowHandler()
+    args = sys.argv[1:]
+
+    # 优先交给常驻进程执行，省去模块导入和数据加载
+    if not args or args[0].lower() not in _INTERACTIVE_COMMANDS:
+        try:
+            output = _daemon_output(args)
+        except OSError as e:
+            print(f"❌ Flow常驻进程执行命令失败: {e}（命令可能已部分执行，未在本地重试）", file=sys.stderr)
+            sys.exit(1)
+        if output is not None:
+            sys.stdout.write(output)
+            return
 
-    # 解析命令行参数
-    if len(sys.argv) > 1:
-        handler.handle_command(sys.argv[1:])
-    else:
-        handler.handle_command([])
+    handler = FlowHandler()
+    handler.handle_command(args)
 
 
 if __name__ == "__main__":
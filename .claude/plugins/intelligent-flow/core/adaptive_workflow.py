@@ -4,17 +4,103 @@
 基于用户学习数据动态调整的3-6-3工作流
 """
 
+import atexit
+import copy
 import json
-import statistics
+import os
+import tempfile
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import ClassVar, Dict, List, Mapping, Optional, Tuple
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
-from intelligent_engine import IntelligentEngine, WorkflowStage, ProjectType, DeveloperProfile
+try:
+    import orjson  # 可选依赖，JSON编解码更快且原生输出UTF-8
+except ImportError:
+    orjson = None
 
+from intelligent_engine import IntelligentEngine, WorkflowStage, ProjectType, DeveloperProfile, _DATACLASS_OPTIONS
 
-@dataclass
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _atomic_write(path: Path, data: bytes, prefix: str):
+    """一次性写入同目录临时文件后原子替换，中途崩溃不会留下截断的文件"""
+    fd, tmp_file = tempfile.mkstemp(dir=path.parent, prefix=prefix, suffix=".json")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
+# 累积该数量的未保存成功模式后立即写盘，其余在进程退出时写入
+_PATTERN_FLUSH_THRESHOLD = 5
+
+# 小时 → (工作时段, 该时段加权的步骤及系数)
+_SESSION_BY_HOUR = {
+    # 上午适合分析和设计
+    **{hour: ("morning", (("requirement_analysis", 1.2), ("technical_design", 1.1))) for hour in range(9, 12)},
+    # 下午适合实现
+    **{hour: ("afternoon", (("core_implementation", 1.2),)) for hour in range(14, 17)},
+    # 晚上适合测试和优化
+    **{hour: ("evening", (("testing_validation", 1.2),)) for hour in range(19, 22)},
+}
+
+# 痛点关键词 → (加强的步骤, 时长系数, 权重系数)，按优先级排列，每个痛点只命中第一条
+_PAIN_RULES = (
+    (("需求",), "requirement_analysis", 1.3, 1.1),        # 加强需求分析
+    (("测试", "质量"), "testing_validation", 1.3, 1.1),   # 加强测试验收
+    (("架构", "设计"), "technical_design", 1.3, 1.1),     # 加强技术设计
+)
+
+# 项目类型 → 固定推荐的关注点
+_TYPE_RECOMMENDATIONS = {
+    "web_app": ("用户体验设计", "性能优化", "跨浏览器兼容"),
+    "cli_tool": ("错误处理", "参数验证", "帮助文档"),
+    "api_service": ("安全性", "并发处理", "API文档"),
+    "mobile_app": ("内存管理", "网络优化", "用户体验"),
+    "automation": ("异常恢复", "日志记录", "可维护性"),
+}
+
+
+def personalization_score(total_projects: int, learned_data: int, quality_clarity: int) -> float:
+    """个性化程度：各项已有数据按满额（项目10个、学习点5个、质量标准3个）截断后取平均"""
+    total = 0.0
+    count = 0
+    if total_projects > 0:
+        total += min(total_projects / 10.0, 1.0)
+        count += 1
+    if learned_data > 0:
+        total += min(learned_data / 5.0, 1.0)
+        count += 1
+    if quality_clarity > 0:
+        total += min(quality_clarity / 3.0, 1.0)
+        count += 1
+    return total / count if count else 0.0
+
+
+# 已解析的自适应配置缓存：配置文件路径 → (mtime_ns, AdaptiveConfiguration)
+_CONFIG_CACHE: Dict[Path, Tuple[int, "AdaptiveConfiguration"]] = {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class WorkflowStep:
     """工作流步骤"""
     name: str
@@ -24,7 +110,7 @@ class WorkflowStep:
     dependencies: List[str]  # 依赖的前置步骤
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AdaptiveConfiguration:
     """自适应配置"""
     step_durations: Dict[str, int]
@@ -37,134 +123,197 @@ class AdaptiveConfiguration:
 class AdaptiveWorkflow:
     """自适应工作流程管理器"""
 
+    # 基础工作流步骤（所有实例共享，只读）
+    _BASE_STEPS: ClassVar[Mapping[str, WorkflowStep]] = MappingProxyType({
+        "requirement_analysis": WorkflowStep(
+            name="需求拆解",
+            base_duration=25,
+            weight=0.25,
+            adaptable=True,
+            dependencies=[]
+        ),
+        "technical_design": WorkflowStep(
+            name="技术设计",
+            base_duration=15,
+            weight=0.15,
+            adaptable=True,
+            dependencies=["requirement_analysis"]
+        ),
+        "core_implementation": WorkflowStep(
+            name="核心实现",
+            base_duration=30,
+            weight=0.35,
+            adaptable=True,
+            dependencies=["technical_design"]
+        ),
+        "testing_validation": WorkflowStep(
+            name="测试验收",
+            base_duration=25,
+            weight=0.25,
+            adaptable=True,
+            dependencies=["core_implementation"]
+        )
+    })
+
     def __init__(self, engine: IntelligentEngine):
         self.engine = engine
         self.plugin_root = Path(engine.plugin_root)
         self.config_dir = self.plugin_root / "data" / "adaptive"
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-
-        # 基础工作流步骤
-        self.base_steps = {
-            "requirement_analysis": WorkflowStep(
-                name="需求拆解",
-                base_duration=25,
-                weight=0.25,
-                adaptable=True,
-                dependencies=[]
-            ),
-            "technical_design": WorkflowStep(
-                name="技术设计",
-                base_duration=15,
-                weight=0.15,
-                adaptable=True,
-                dependencies=["requirement_analysis"]
-            ),
-            "core_implementation": WorkflowStep(
-                name="核心实现",
-                base_duration=30,
-                weight=0.35,
-                adaptable=True,
-                dependencies=["technical_design"]
-            ),
-            "testing_validation": WorkflowStep(
-                name="测试验收",
-                base_duration=25,
-                weight=0.25,
-                adaptable=True,
-                dependencies=["core_implementation"]
-            )
-        }
+        # 配置目录在首次写入时才创建
+        self._config_dir_ready = False
 
         # 加载自适应配置
         self.adaptive_config = self._load_adaptive_config()
 
+        # 成功模式（首次使用时从磁盘加载）
+        self.success_file = self.config_dir / "success_patterns.json"
+        self._success_patterns: Optional[List[Dict]] = None
+        # 项目类型 → 成功模式列表（按时间顺序）
+        self._patterns_by_type: Dict[str, List[Dict]] = defaultdict(list)
+        # 自上次写盘以来新增的成功模式数量
+        self._pending_patterns = 0
+
     def _load_adaptive_config(self) -> AdaptiveConfiguration:
         """加载自适应配置"""
         config_file = self.config_dir / "adaptive_config.json"
 
-        if config_file.exists():
+        try:
+            mtime = os.stat(config_file).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if mtime is not None:
+            # 文件未变化时复用已解析的配置（记录执行情况时会原地修改配置，因此返回副本）
+            cached = _CONFIG_CACHE.get(config_file)
+            if cached is not None and cached[0] == mtime:
+                return copy.deepcopy(cached[1])
+
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return AdaptiveConfiguration(**data)
+                with open(config_file, 'rb') as f:
+                    data = _loads(f.read())
+                config = AdaptiveConfiguration(**data)
+                _CONFIG_CACHE[config_file] = (mtime, copy.deepcopy(config))
+                return config
             except Exception as e:
                 print(f"加载自适应配置失败: {e}")
 
         # 返回默认配置
         return AdaptiveConfiguration(
-            step_durations={step.name: step.base_duration for step in self.base_steps.values()},
-            step_weights={step.name: step.weight for step in self.base_steps.values()},
+            step_durations={step.name: step.base_duration for step in self._BASE_STEPS.values()},
+            step_weights={step.name: step.weight for step in self._BASE_STEPS.values()},
             quality_focus_areas=[],
             preferred_approaches={},
             risk_factors=[]
         )
 
+    def _ensure_config_dir(self):
+        """首次写入前创建配置目录，只读的实例不触碰文件系统"""
+        if not self._config_dir_ready:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            self._config_dir_ready = True
+
     def _save_adaptive_config(self):
         """保存自适应配置"""
         config_file = self.config_dir / "adaptive_config.json"
         try:
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.adaptive_config.__dict__, f, ensure_ascii=False, indent=2)
+            self._ensure_config_dir()
+            _atomic_write(config_file, _dumps(asdict(self.adaptive_config)), ".cfg")
+            # 写入后直接更新缓存，下次构造无需重新解析
+            _CONFIG_CACHE[config_file] = (
+                os.stat(config_file).st_mtime_ns, copy.deepcopy(self.adaptive_config)
+            )
         except Exception as e:
             print(f"保存自适应配置失败: {e}")
 
-    def generate_adaptive_workflow(self, project_type: ProjectType, complexity: str) -> Dict:
-        """生成自适应工作流程"""
-        # 基于历史数据调整配置
-        self._adjust_configuration_from_history(project_type)
-
-        # 基于用户偏好调整
-        self._adjust_configuration_from_preferences()
+    def _load_success_patterns(self) -> List[Dict]:
+        """加载成功模式，只在首次使用时读取文件"""
+        if self._success_patterns is None:
+            try:
+                with open(self.success_file, 'rb') as f:
+                    self._success_patterns = _loads(f.read())
+            except FileNotFoundError:
+                self._success_patterns = []
+            except Exception as e:
+                print(f"读取成功模式失败: {e}")
+                self._success_patterns = []
+            self._index_success_patterns()
+        return self._success_patterns
+
+    def _index_success_patterns(self):
+        """按项目类型重建成功模式索引"""
+        self._patterns_by_type.clear()
+        for pattern in self._success_patterns:
+            self._patterns_by_type[pattern.get("project_type")].append(pattern)
+
+    def generate_adaptive_workflow(self, project_type: ProjectType, complexity: str,
+                                   now: Optional[datetime] = None) -> Dict:
+        """生成自适应工作流程，now 为本次生成使用的当前时间（默认读取系统时钟）
+
+        各项调整只作用于本次生成的副本，不修改持久化的自适应配置，
+        多次生成不会累积放大；配置只在 record_workflow_execution 中更新。
+        """
+        profile = self.engine.profile
+        config = self.adaptive_config
+        durations = dict(config.step_durations)
+        weights = dict(config.step_weights)
+        quality_focus = config.quality_focus_areas
+
+        # 基于历史数据调整（新用户没有该类型的历史时跳过）
+        if project_type.value in profile.project_preferences:
+            self._adjust_configuration_from_history(project_type, durations, weights)
+
+        # 基于用户偏好调整（尚未学习到任何偏好时跳过）
+        if profile.quality_standards or profile.work_patterns:
+            quality_focus = self._adjust_configuration_from_preferences(
+                durations, weights, quality_focus, now
+            )
 
         # 生成工作流程
         workflow = {
             "project_type": project_type.value,
             "complexity": complexity,
-            "estimated_total_time": self._calculate_total_time(),
-            "steps": self._generate_adaptive_steps(),
-            "quality_focus": self.adaptive_config.quality_focus_areas,
-            "risk_factors": self.adaptive_config.risk_factors,
+            "estimated_total_time": sum(durations.values()),
+            "steps": self._generate_adaptive_steps(durations, weights, quality_focus),
+            "quality_focus": quality_focus,
+            "risk_factors": config.risk_factors,
             "personalization_level": self._calculate_personalization_level()
         }
 
         return workflow
 
-    def _adjust_configuration_from_history(self, project_type: ProjectType):
-        """基于历史数据调整配置"""
+    def _adjust_configuration_from_history(self, project_type: ProjectType,
+                                           durations: Dict[str, float], weights: Dict[str, float]):
+        """基于历史数据调整本次的时长和权重"""
         type_key = project_type.value
+        profile = self.engine.profile
 
-        if type_key not in self.engine.profile.project_preferences:
-            return
-
-        history = self.engine.profile.project_preferences[type_key]
-        if not history.get("frequency", 0) > 0:
+        history = profile.project_preferences.get(type_key)
+        if history is None or not history.get("frequency", 0) > 0:
             return
 
         # 调整时间预估
         avg_time = history.get("avg_time")
         if avg_time:
-            current_total = sum(self.adaptive_config.step_durations.values())
+            current_total = sum(durations.values())
             if current_total > 0:
                 adjustment_factor = avg_time / current_total
-                for step_name in self.adaptive_config.step_durations:
-                    self.adaptive_config.step_durations[step_name] = int(
-                        self.adaptive_config.step_durations[step_name] * adjustment_factor
-                    )
+                for step_name, duration in durations.items():
+                    durations[step_name] = int(duration * adjustment_factor)
 
         # 调整权重分配
-        if type_key in self.engine.profile.learned_optimizations:
-            optimizations = self.engine.profile.learned_optimizations[type_key]
-            if "stage_weights" in optimizations:
-                self.adaptive_config.step_weights.update(optimizations["stage_weights"])
-
-    def _adjust_configuration_from_preferences(self):
-        """基于用户偏好调整配置"""
+        optimizations = profile.learned_optimizations.get(type_key)
+        if optimizations is not None and "stage_weights" in optimizations:
+            weights.update(optimizations["stage_weights"])
+
+    def _adjust_configuration_from_preferences(self, durations: Dict[str, float], weights: Dict[str, float],
+                                               quality_focus: List[str],
+                                               now: Optional[datetime] = None) -> List[str]:
+        """基于用户偏好调整本次的时长和权重，返回本次的质量关注点"""
         profile = self.engine.profile
 
         # 调整质量关注点
         if profile.quality_standards:
             quality_focus = profile.quality_standards.get("quality_focus", [])
-            self.adaptive_config.quality_focus_areas = quality_focus
 
         # 调整偏好的方法
         if profile.work_patterns:
@@ -173,67 +322,45 @@ class AdaptiveWorkflow:
             # 根据工作时段调整
             preferred_sessions = patterns.get("preferred_work_sessions")
             if preferred_sessions:
-                self._adjust_for_work_session(preferred_sessions)
+                self._adjust_for_work_session(preferred_sessions, weights, now)
 
             # 根据常见痛点调整
             pain_points = patterns.get("common_pain_points", [])
             if pain_points:
-                self._adjust_for_pain_points(pain_points)
-
-    def _adjust_for_work_session(self, preferred_sessions: str):
-        """根据偏好的工作时段调整"""
-        current_hour = datetime.now().hour
+                self._adjust_for_pain_points(pain_points, durations, weights)
 
-        # 根据时段调整各步骤权重
-        if "morning" in preferred_sessions and 9 <= current_hour <= 11:
-            # 上午适合分析和设计
-            self.adaptive_config.step_weights["requirement_analysis"] *= 1.2
-            self.adaptive_config.step_weights["technical_design"] *= 1.1
+        return quality_focus
 
-        elif "afternoon" in preferred_sessions and 14 <= current_hour <= 16:
-            # 下午适合实现
-            self.adaptive_config.step_weights["core_implementation"] *= 1.2
+    def _adjust_for_work_session(self, preferred_sessions: str, weights: Dict[str, float],
+                                 now: Optional[datetime] = None):
+        """根据偏好的工作时段调整权重"""
+        session = _SESSION_BY_HOUR.get((now or datetime.now()).hour)
+        if session is None:
+            return
 
-        elif "evening" in preferred_sessions and 19 <= current_hour <= 21:
-            # 晚上适合测试和优化
-            self.adaptive_config.step_weights["testing_validation"] *= 1.2
+        session_tag, boosts = session
+        if session_tag in preferred_sessions:
+            for step_key, multiplier in boosts:
+                weights[step_key] *= multiplier
 
-    def _adjust_for_pain_points(self, pain_points: List[str]):
-        """根据常见痛点调整"""
+    def _adjust_for_pain_points(self, pain_points: List[str],
+                                durations: Dict[str, float], weights: Dict[str, float]):
+        """根据常见痛点调整时长和权重"""
         for pain_point in pain_points:
-            if "需求" in pain_point:
-                # 加强需求分析
-                self.adaptive_config.step_durations["requirement_analysis"] *= 1.3
-                self.adaptive_config.step_weights["requirement_analysis"] *= 1.1
-
-            elif "测试" in pain_point or "质量" in pain_point:
-                # 加强测试验收
-                self.adaptive_config.step_durations["testing_validation"] *= 1.3
-                self.adaptive_config.step_weights["testing_validation"] *= 1.1
-
-            elif "架构" in pain_point or "设计" in pain_point:
-                # 加强技术设计
-                self.adaptive_config.step_durations["technical_design"] *= 1.3
-                self.adaptive_config.step_weights["technical_design"] *= 1.1
-
-    def _calculate_total_time(self) -> int:
-        """计算总预估时间"""
-        return sum(self.adaptive_config.step_durations.values())
-
-    def _generate_adaptive_steps(self) -> List[Dict]:
+            for keywords, step_key, duration_factor, weight_factor in _PAIN_RULES:
+                if any(keyword in pain_point for keyword in keywords):
+                    durations[step_key] *= duration_factor
+                    weights[step_key] *= weight_factor
+                    break
+
+    def _generate_adaptive_steps(self, durations: Dict[str, float], weights: Dict[str, float],
+                                 quality_focus: List[str]) -> List[Dict]:
         """生成自适应步骤"""
         steps = []
 
-        for step_name, step in self.base_steps.items():
-            if step_name in self.adaptive_config.step_durations:
-                duration = self.adaptive_config.step_durations[step_name]
-            else:
-                duration = step.base_duration
-
-            if step_name in self.adaptive_config.step_weights:
-                weight = self.adaptive_config.step_weights[step_name]
-            else:
-                weight = step.weight
+        for step_name, step in self._BASE_STEPS.items():
+            duration = durations.get(step_name, step.base_duration)
+            weight = weights.get(step_name, step.weight)
 
             # 生成自适应步骤描述
             step_desc = {
@@ -242,27 +369,28 @@ class AdaptiveWorkflow:
                 "duration": duration,
                 "weight": weight,
                 "adaptable": step.adaptable,
-                "dependencies": step.dependencies,
-                "personalized_tips": self._generate_step_tips(step_name)
+                "dependencies": list(step.dependencies),
+                "personalized_tips": self._generate_step_tips(step_name, quality_focus)
             }
 
             steps.append(step_desc)
 
         return steps
 
-    def _generate_step_tips(self, step_name: str) -> List[str]:
+    def _generate_step_tips(self, step_name: str, quality_focus: List[str]) -> List[str]:
         """生成步骤的个性化提示"""
         tips = []
+        config = self.adaptive_config
 
         # 基于学习数据的提示
         if step_name == "requirement_analysis":
-            if self.adaptive_config.quality_focus_areas:
-                tips.append(f"重点关注：{', '.join(self.adaptive_config.quality_focus_areas[:2])}")
+            if quality_focus:
+                tips.append(f"重点关注：{', '.join(quality_focus[:2])}")
 
         elif step_name == "technical_design":
-            if "security" in self.adaptive_config.quality_focus_areas:
+            if "security" in quality_focus:
                 tips.append("优先考虑安全架构设计")
-            if "performance" in self.adaptive_config.quality_focus_areas:
+            if "performance" in quality_focus:
                 tips.append("预留性能优化空间")
 
         elif step_name == "core_implementation":
@@ -271,43 +399,28 @@ class AdaptiveWorkflow:
                 tips.append(f"使用您偏好的编程风格：{preferred_approaches}")
 
         elif step_name == "testing_validation":
-            if self.adaptive_config.risk_factors:
-                tips.append(f"重点测试风险点：{', '.join(self.adaptive_config.risk_factors[:2])}")
+            if config.risk_factors:
+                tips.append(f"重点测试风险点：{', '.join(config.risk_factors[:2])}")
 
         return tips
 
     def _calculate_personalization_level(self) -> float:
         """计算个性化程度"""
-        factors = []
-
-        # 基于项目数量
-        total_projects = sum(data.get("frequency", 0)
-                           for data in self.engine.profile.project_preferences.values())
-        if total_projects > 0:
-            factors.append(min(total_projects / 10.0, 1.0))  # 最多10个项目达到完全个性化
-
-        # 基于学习数据的丰富度
-        learned_data = len(self.engine.profile.learned_optimizations)
-        if learned_data > 0:
-            factors.append(min(learned_data / 5.0, 1.0))  # 最多5个学习点达到完全个性化
-
-        # 基于质量标准的明确度
-        if self.engine.profile.quality_standards:
-            quality_clarity = len(self.engine.profile.quality_standards)
-            factors.append(min(quality_clarity / 3.0, 1.0))  # 最多3个标准达到完全个性化
-
-        if not factors:
-            return 0.0
-
-        return statistics.mean(factors)
+        profile = self.engine.profile
+        return personalization_score(
+            self.engine.get_total_projects(),
+            len(profile.learned_optimizations),
+            len(profile.quality_standards)
+        )
 
-    def record_workflow_execution(self, workflow: Dict, execution_data: Dict):
-        """记录工作流执行情况"""
+    def record_workflow_execution(self, workflow: Dict, execution_data: Dict,
+                                  now: Optional[datetime] = None):
+        """记录工作流执行情况，now 为记录时间（默认读取系统时钟）"""
         # 更新自适应配置
         self._update_adaptive_config_from_execution(workflow, execution_data)
 
         # 记录成功模式
-        self._record_success_patterns(workflow, execution_data)
+        self._record_success_patterns(workflow, execution_data, now)
 
         # 保存更新后的配置
         self._save_adaptive_config()
@@ -317,22 +430,28 @@ class AdaptiveWorkflow:
         actual_times = execution_data.get("step_times", {})
         satisfaction = execution_data.get("satisfaction", 3)
 
-        # 更新步骤时间预估
+        # 根据满意度调整（与步骤无关，循环外计算一次）
+        if satisfaction >= 4:  # 高满意度
+            satisfaction_factor = 0.95  # 稍微减少预估
+        elif satisfaction <= 2:  # 低满意度
+            satisfaction_factor = 1.05  # 稍微增加预估
+        else:
+            satisfaction_factor = 1.0
+
+        # 采纳本次工作流使用的质量关注点
+        quality_focus = workflow.get("quality_focus")
+        if quality_focus is not None:
+            self.adaptive_config.quality_focus_areas = list(quality_focus)
+
+        # 更新步骤时间预估（指数移动平均）
+        durations = self.adaptive_config.step_durations
         for step_key, actual_time in actual_times.items():
-            if step_key in self.adaptive_config.step_durations:
-                current_est = self.adaptive_config.step_durations[step_key]
-                # 指数移动平均更新
-                new_est = current_est * 0.7 + actual_time * 0.3
-
-                # 根据满意度调整
-                if satisfaction >= 4:  # 高满意度
-                    new_est *= 0.95  # 稍微减少预估
-                elif satisfaction <= 2:  # 低满意度
-                    new_est *= 1.05  # 稍微增加预估
-
-                self.adaptive_config.step_durations[step_key] = int(new_est)
+            current_est = durations.get(step_key)
+            if current_est is not None:
+                durations[step_key] = int((current_est * 0.7 + actual_time * 0.3) * satisfaction_factor)
 
-    def _record_success_patterns(self, workflow: Dict, execution_data: Dict):
+    def _record_success_patterns(self, workflow: Dict, execution_data: Dict,
+                                 now: Optional[datetime] = None):
         """记录成功模式"""
         satisfaction = execution_data.get("satisfaction", 3)
 
@@ -343,58 +462,59 @@ class AdaptiveWorkflow:
                 "complexity": workflow["complexity"],
                 "step_weights": workflow["steps"],
                 "quality_focus": workflow["quality_focus"],
-                "timestamp": datetime.now().isoformat()
+                "timestamp": (now or datetime.now()).isoformat()
             }
 
             # 保存成功模式
-            success_file = self.config_dir / "success_patterns.json"
-            patterns = []
-            if success_file.exists():
-                try:
-                    with open(success_file, 'r', encoding='utf-8') as f:
-                        patterns = json.load(f)
-                except:
-                    patterns = []
-
+            patterns = self._load_success_patterns()
             patterns.append(success_pattern)
 
             # 保持最近20个成功模式
             if len(patterns) > 20:
-                patterns = patterns[-20:]
+                del patterns[:-20]
+                self._index_success_patterns()
+            else:
+                self._patterns_by_type[success_pattern["project_type"]].append(success_pattern)
 
-            try:
-                with open(success_file, 'w', encoding='utf-8') as f:
-                    json.dump(patterns, f, ensure_ascii=False, indent=2)
-            except Exception as e:
-                print(f"保存成功模式失败: {e}")
+            if not self._pending_patterns:
+                atexit.register(self.flush)  # 进程退出前保证落盘
+            self._pending_patterns += 1
+            if self._pending_patterns >= _PATTERN_FLUSH_THRESHOLD:
+                self.flush()
+
+    def flush(self):
+        """把未保存的成功模式一次性写入文件"""
+        if not self._pending_patterns:
+            return
+
+        try:
+            self._ensure_config_dir()
+            _atomic_write(self.success_file, _dumps(self._success_patterns), ".patterns")
+        except Exception as e:
+            print(f"保存成功模式失败: {e}")
+            return
+        self._pending_patterns = 0
+        atexit.unregister(self.flush)
 
     def get_adaptive_recommendations(self, project_type: ProjectType) -> List[str]:
         """获取自适应推荐"""
         recommendations = []
 
         # 基于历史成功模式
-        success_file = self.config_dir / "success_patterns.json"
-        if success_file.exists():
+        if self._load_success_patterns():
             try:
-                with open(success_file, 'r', encoding='utf-8') as f:
-                    patterns = json.load(f)
-
                 # 找出相似项目的成功模式
-                similar_patterns = [
-                    p for p in patterns
-                    if p["project_type"] == project_type.value
-                ]
+                similar_patterns = self._patterns_by_type.get(project_type.value)
 
                 if similar_patterns:
                     # 分析最常用的质量关注点
-                    quality_focus_counts = {}
+                    quality_focus_counts = Counter()
                     for pattern in similar_patterns[-5:]:  # 最近5个
-                        for focus in pattern.get("quality_focus", []):
-                            quality_focus_counts[focus] = quality_focus_counts.get(focus, 0) + 1
+                        quality_focus_counts.update(pattern.get("quality_focus", ()))
 
-                    if quality_focus_counts:
-                        most_common_focus = max(quality_focus_counts, key=quality_focus_counts.get)
-                        recommendations.append(f"基于历史数据，建议重点关注：{most_common_focus}")
+                    most_common = quality_focus_counts.most_common(1)
+                    if most_common:
+                        recommendations.append(f"基于历史数据，建议重点关注：{most_common[0][0]}")
 
             except Exception as e:
                 print(f"读取成功模式失败: {e}")
@@ -406,15 +526,8 @@ class AdaptiveWorkflow:
                 recommendations.append(f"根据您的偏好，建议重点关注：{', '.join(user_focus)}")
 
         # 基于项目类型的推荐
-        type_recommendations = {
-            "web_app": ["用户体验设计", "性能优化", "跨浏览器兼容"],
-            "cli_tool": ["错误处理", "参数验证", "帮助文档"],
-            "api_service": ["安全性", "并发处理", "API文档"],
-            "mobile_app": ["内存管理", "网络优化", "用户体验"],
-            "automation": ["异常恢复", "日志记录", "可维护性"]
-        }
-
-        if project_type.value in type_recommendations:
-            recommendations.extend(type_recommendations[project_type.value])
+        type_recommendations = _TYPE_RECOMMENDATIONS.get(project_type.value)
+        if type_recommendations:
+            recommendations.extend(type_recommendations)
 
         return recommendations
\ No newline at end of file
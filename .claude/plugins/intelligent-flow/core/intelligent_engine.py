@@ -4,16 +4,113 @@
 学习式AI驱动的项目开发流程核心引擎
 """
 
+import atexit
 import json
 import os
+import re
+import sys
 import time
 import hashlib
+from collections import namedtuple
+from functools import cached_property, lru_cache
+from operator import itemgetter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+try:
+    import ahocorasick  # pyahocorasick，可选依赖
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # 可选依赖，JSON编解码更快且原生支持datetime
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_record(obj) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+
+    def _dumps_record(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+# 插件需兼容3.8，dataclass的slots参数仅在3.10+可用
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# 档案两次写盘的最小间隔（秒），期间的更新只标记为待保存
+_SAVE_INTERVAL = 5.0
+
+# 工作流状态的缓存时长（秒），轮询查询无需更高精度
+_STATUS_TTL = 0.2
+
+# 档案中保留的满意度记录上限
+_MAX_SATISFACTION_SCORES = 1000
+
+
+# 编译后的关键词表：原表、只含ASCII关键词的子表、匹配任一关键词的正则、
+# Aho-Corasick自动机（未安装pyahocorasick时为None）
+KeywordMatcher = namedtuple("KeywordMatcher", "table ascii_table any_keyword automaton")
+
+
+def _build_keyword_matcher(keyword_table) -> KeywordMatcher:
+    """预编译关键词表；自动机的值为(关键词, 所属类别)"""
+    ascii_table = {
+        category: tuple(keyword for keyword in keywords if keyword.isascii())
+        for category, keywords in keyword_table.items()
+    }
+    any_keyword = re.compile("|".join(
+        re.escape(keyword) for keyword in sorted(
+            {keyword for keywords in keyword_table.values() for keyword in keywords}, key=len, reverse=True
+        )
+    ))
+
+    automaton = None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for category, keywords in keyword_table.items():
+            for keyword in keywords:
+                categories = automaton.get(keyword, (keyword, ()))[1]
+                automaton.add_word(keyword, (keyword, categories + (category,)))
+        automaton.make_automaton()
+
+    return KeywordMatcher(keyword_table, ascii_table, any_keyword, automaton)
+
+
+def _keyword_scores(matcher: KeywordMatcher, text: str) -> Dict:
+    """统计text中各类别命中的关键词个数（同一关键词多次出现只计一次），按关键词表顺序返回"""
+    if matcher.automaton is None:
+        # 先用一次正则扫描排除不含任何关键词的文本（正则无法报告相互重叠的关键词，命中后仍逐个统计）
+        if matcher.any_keyword.search(text) is None:
+            return dict.fromkeys(matcher.table, 0)
+
+        # 纯ASCII文本不可能包含中文关键词，只需检查ASCII关键词
+        keyword_table = matcher.ascii_table if text.isascii() else matcher.table
+        # 用列表推导式计数，比 sum() 逐个累加生成器的结果更快
+        return {
+            category: len([keyword for keyword in keywords if keyword in text])
+            for category, keywords in keyword_table.items()
+        }
+
+    matched = {keyword: categories for _, (keyword, categories) in matcher.automaton.iter(text)}
+    scores = dict.fromkeys(matcher.table, 0)
+    for categories in matched.values():
+        for category in categories:
+            scores[category] += 1
+    return scores
+
 
 class WorkflowStage(Enum):
     """工作流阶段枚举"""
@@ -33,7 +130,95 @@ class ProjectType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# 项目类型关键词（同一类型内重复的关键词按次数计分）
+_TYPE_KEYWORDS = {
+    ProjectType.WEB_APP: ("网站", "web", "前端", "页面", "界面", "ui", "网页"),
+    ProjectType.CLI_TOOL: ("命令行", "cli", "工具", "脚本", "终端", "命令"),
+    ProjectType.API_SERVICE: ("api", "接口", "服务", "后端", "服务器", "接口"),
+    ProjectType.MOBILE_APP: ("app", "应用", "移动", "手机", "android", "ios"),
+    ProjectType.AUTOMATION: ("自动化", "批量", "定时", "流程", "工作流"),
+}
+
+# 复杂度关键词，按优先级排列
+_COMPLEXITY_KEYWORDS = {
+    "simple": ("简单", "基础", "单一", "小型", "基础版", "原型"),
+    "medium": ("中等", "标准", "完整", "功能", "系统"),
+    "complex": ("复杂", "高级", "企业级", "大规模", "完整系统", "综合"),
+}
+
+_TYPE_MATCHER = _build_keyword_matcher(_TYPE_KEYWORDS)
+_COMPLEXITY_MATCHER = _build_keyword_matcher(_COMPLEXITY_KEYWORDS)
+
+# 无关键词命中时各项目类型的默认复杂度
+_DEFAULT_COMPLEXITY = {
+    ProjectType.WEB_APP: "medium",
+    ProjectType.CLI_TOOL: "simple",
+    ProjectType.API_SERVICE: "medium",
+    ProjectType.MOBILE_APP: "complex",
+    ProjectType.AUTOMATION: "medium",
+}
+
+# 无历史偏好时各项目类型的默认技术栈
+_DEFAULT_TECH_STACKS = {
+    ProjectType.WEB_APP: ("React", "Node.js", "TypeScript"),
+    ProjectType.CLI_TOOL: ("Node.js", "Commander.js", "JavaScript"),
+    ProjectType.API_SERVICE: ("Python", "FastAPI", "PostgreSQL"),
+    ProjectType.MOBILE_APP: ("React Native", "TypeScript", "Redux"),
+    ProjectType.AUTOMATION: ("Python", "Selenium", "Jinja2"),
+}
+
+# 各复杂度的基础开发时间（分钟）及项目类型的时间系数
+_BASE_TIMES = {"simple": 60, "medium": 120, "complex": 240}
+_PROJECT_TIME_MULTIPLIERS = {
+    ProjectType.WEB_APP: 1.2,
+    ProjectType.CLI_TOOL: 0.8,
+    ProjectType.API_SERVICE: 1.0,
+    ProjectType.MOBILE_APP: 1.5,
+    ProjectType.AUTOMATION: 1.1,
+}
+
+# 各项目类型的常见问题
+_COMMON_ISSUES_BY_TYPE = {
+    ProjectType.WEB_APP: ("状态管理复杂度", "性能优化时机", "浏览器兼容性"),
+    ProjectType.CLI_TOOL: ("错误处理不完整", "参数验证缺失", "跨平台兼容"),
+    ProjectType.API_SERVICE: ("并发处理", "数据一致性", "安全性问题"),
+    ProjectType.MOBILE_APP: ("内存泄漏", "网络优化", "用户体验"),
+    ProjectType.AUTOMATION: ("异常处理", "错误恢复", "日志记录"),
+}
+
+# 各工作流阶段对应的项目进度
+_STAGE_PROGRESS = {
+    WorkflowStage.REQUIREMENT: 0.25,
+    WorkflowStage.IMPLEMENTATION: 0.5,
+    WorkflowStage.TESTING: 0.25,
+    WorkflowStage.COMPLETED: 1.0,
+}
+
+# 关键词分析只依赖描述文本，重复或相同的描述直接复用结果
+_ANALYSIS_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=_ANALYSIS_CACHE_SIZE)
+def _detect_project_type(description_lower: str) -> ProjectType:
+    """按关键词得分检测项目类型，无命中时返回UNKNOWN"""
+    scores = _keyword_scores(_TYPE_MATCHER, description_lower)
+
+    # 返回得分最高的类型（一次遍历，同分时取关键词表中靠前的类型）
+    best_type, best_score = max(scores.items(), key=itemgetter(1))
+    return best_type if best_score else ProjectType.UNKNOWN
+
+
+@lru_cache(maxsize=_ANALYSIS_CACHE_SIZE)
+def _keyword_complexity(description_lower: str) -> Optional[str]:
+    """按simple、medium、complex的优先级返回第一个命中关键词的复杂度，无命中时返回None"""
+    scores = _keyword_scores(_COMPLEXITY_MATCHER, description_lower)
+    for complexity, score in scores.items():
+        if score:
+            return complexity
+    return None
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DeveloperProfile:
     """开发者学习档案"""
     # 项目偏好
@@ -60,7 +245,7 @@ class DeveloperProfile:
             self.quality_standards = {}
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ProjectContext:
     """项目上下文"""
     project_type: ProjectType
@@ -69,17 +254,25 @@ class ProjectContext:
     estimated_time: int
     tech_stack: List[str]
     current_stage: WorkflowStage
-    start_time: datetime
-    last_activity: datetime
+    start_time: float  # epoch秒（time.time()），只在持久化和展示时转换为日期
+    last_activity: float
     issues_found: List[str] = None
     user_preferences: Dict[str, Any] = None
+    # project_type.value 的缓存，用作档案和记录中的类型键
+    type_key: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
+        self.type_key = self.project_type.value
         if self.issues_found is None:
             self.issues_found = []
         if self.user_preferences is None:
             self.user_preferences = {}
 
+    @property
+    def start_time_iso(self) -> str:
+        """开始时间的ISO格式（本地时间），用于写入项目记录"""
+        return datetime.fromtimestamp(self.start_time).isoformat()
+
 
 class IntelligentEngine:
     """智能工作流引擎"""
@@ -89,55 +282,148 @@ class IntelligentEngine:
         self.data_dir = self.plugin_root / "data"
         self.data_dir.mkdir(exist_ok=True)
 
-        # 数据文件路径
+        # 数据文件路径（文件内容在首次访问 profile/projects/patterns 时才读取）
         self.profile_file = self.data_dir / "developer_profile.json"
-        self.projects_file = self.data_dir / "projects.json"
+        self.projects_file = self.data_dir / "projects.jsonl"  # 每行一条项目记录，只追加
+        self._legacy_projects_file = self.data_dir / "projects.json"
+        self._legacy_checked = False  # 旧版项目历史是否已确认无需迁移
         self.patterns_file = self.data_dir / "patterns.json"
 
-        # 初始化数据
-        self.profile = self._load_profile()
-        self.projects = self._load_projects()
-        self.patterns = self._load_patterns()
-
         # 当前项目上下文
         self.current_context: Optional[ProjectContext] = None
 
+        # 项目统计缓存 (总项目数, 最常做的项目类型)，项目频率变化时失效
+        self._project_stats: Optional[Tuple[int, Optional[Tuple[str, Dict]]]] = None
+
+        # 工作流状态缓存 (monotonic时间, 项目上下文, (阶段, 问题数), 状态)
+        self._status_cache: Optional[Tuple[float, ProjectContext, Tuple, Dict]] = None
+
+        # 档案待保存标记及上次写盘时间（None表示尚未写过，首次更新立即保存）
+        self._profile_dirty = False
+        self._last_save: Optional[float] = None
+
+        # 档案每次更新时递增，依赖档案内容的缓存据此判断是否失效
+        self.profile_version = 0
+
+    @cached_property
+    def profile(self) -> DeveloperProfile:
+        """开发者档案"""
+        return self._load_profile()
+
+    @cached_property
+    def projects(self) -> List[Dict]:
+        """项目历史"""
+        return self._load_projects()
+
+    @cached_property
+    def patterns(self) -> Dict:
+        """模式数据"""
+        return self._load_patterns()
+
     def _load_profile(self) -> DeveloperProfile:
         """加载开发者档案"""
         if self.profile_file.exists():
             try:
-                with open(self.profile_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.profile_file, 'rb') as f:
+                    data = _loads(f.read())
                 return DeveloperProfile(**data)
             except Exception as e:
                 print(f"加载档案失败: {e}")
 
         return DeveloperProfile()
 
-    def _save_profile(self):
-        """保存开发者档案"""
+    def _mark_profile_dirty(self):
+        """标记档案待保存，距上次写盘超过间隔时立即保存，否则留到下次保存或进程退出"""
+        self.profile_version += 1
+        if not self._profile_dirty:
+            atexit.register(self.flush)  # 进程退出前保证落盘
+            self._profile_dirty = True
+
+        if self._last_save is None or time.monotonic() - self._last_save >= _SAVE_INTERVAL:
+            self.flush()
+
+    def flush(self) -> bool:
+        """把待保存的档案写入文件（项目记录在启动时已直接追加），写入失败时保留待保存标记"""
+        if not self._profile_dirty:
+            return True
+
+        # 失败时同样计时，按保存间隔重试而不是每次更新都重写
+        self._last_save = time.monotonic()
+        if not self._save_profile():
+            return False
+
+        self._profile_dirty = False
+        atexit.unregister(self.flush)
+        return True
+
+    def _save_profile(self) -> bool:
+        """保存开发者档案，返回是否成功"""
         try:
-            with open(self.profile_file, 'w', encoding='utf-8') as f:
-                json.dump(asdict(self.profile), f, ensure_ascii=False, indent=2, default=str)
+            # orjson直接序列化dataclass，无需先用asdict深拷贝整个档案
+            profile = self.profile if orjson is not None else asdict(self.profile)
+            with open(self.profile_file, 'wb') as f:
+                f.write(_dumps(profile))
+            return True
         except Exception as e:
             print(f"保存档案失败: {e}")
+            return False
 
     def _load_projects(self) -> List[Dict]:
-        """加载项目历史"""
-        if self.projects_file.exists():
-            try:
-                with open(self.projects_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"加载项目历史失败: {e}")
+        """加载项目历史，首次运行时把旧版 projects.json 迁移为JSONL"""
+        if not self._migrate_legacy_projects() or not self.projects_file.exists():
+            return []
 
+        try:
+            with open(self.projects_file, 'rb') as f:
+                return [_loads(line) for line in f if line.strip()]
+        except Exception as e:
+            print(f"加载项目历史失败: {e}")
         return []
 
-    def _save_projects(self):
-        """保存项目历史"""
+    def _migrate_legacy_projects(self) -> bool:
+        """旧版 projects.json 仍存在时并入JSONL后删除；无需迁移或迁移成功返回True"""
+        if self._legacy_checked:
+            return True
+        if not self._legacy_projects_file.exists():
+            self._legacy_checked = True
+            return True
+
         try:
-            with open(self.projects_file, 'w', encoding='utf-8') as f:
-                json.dump(self.projects, f, ensure_ascii=False, indent=2, default=str)
+            with open(self._legacy_projects_file, 'rb') as f:
+                legacy_projects = _loads(f.read())
+            try:
+                with open(self.projects_file, 'rb') as f:
+                    projects = [_loads(line) for line in f if line.strip()]
+            except FileNotFoundError:
+                projects = []
+            # 旧记录在前；上次迁移后未能删除旧文件时，已并入的记录按id跳过
+            merged_ids = {project.get("id") for project in projects}
+            self._save_projects(
+                [project for project in legacy_projects if project.get("id") not in merged_ids] + projects
+            )
+        except Exception as e:
+            print(f"迁移项目历史失败: {e}")
+            return False
+
+        try:
+            self._legacy_projects_file.unlink()
+        except OSError:
+            pass  # 下次启动会再次合并，已并入的记录不会重复
+        self._legacy_checked = True
+        return True
+
+    def _save_projects(self, projects: List[Dict]):
+        """整体重写项目历史（仅用于迁移，日常记录走 _append_project）"""
+        tmp_file = self.projects_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(b"".join(_dumps_record(project) for project in projects))
+        os.replace(tmp_file, self.projects_file)
+
+    def _append_project(self, project_record: Dict):
+        """在项目历史末尾追加一条记录，无需重写已有记录"""
+        try:
+            with open(self.projects_file, 'ab') as f:
+                f.write(_dumps_record(project_record))
         except Exception as e:
             print(f"保存项目历史失败: {e}")
 
@@ -145,8 +431,8 @@ class IntelligentEngine:
         """加载模式数据"""
         if self.patterns_file.exists():
             try:
-                with open(self.patterns_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.patterns_file, 'rb') as f:
+                    return _loads(f.read())
             except Exception as e:
                 print(f"加载模式数据失败: {e}")
 
@@ -160,60 +446,28 @@ class IntelligentEngine:
     def _save_patterns(self):
         """保存模式数据"""
         try:
-            with open(self.patterns_file, 'w', encoding='utf-8') as f:
-                json.dump(self.patterns, f, ensure_ascii=False, indent=2, default=str)
+            with open(self.patterns_file, 'wb') as f:
+                f.write(_dumps(self.patterns))
         except Exception as e:
             print(f"保存模式数据失败: {e}")
 
-    def detect_project_type(self, description: str) -> ProjectType:
-        """智能检测项目类型"""
-        description_lower = description.lower()
-
-        # 关键词匹配
-        type_keywords = {
-            ProjectType.WEB_APP: ["网站", "web", "前端", "页面", "界面", "ui", "网页"],
-            ProjectType.CLI_TOOL: ["命令行", "cli", "工具", "脚本", "终端", "命令"],
-            ProjectType.API_SERVICE: ["api", "接口", "服务", "后端", "服务器", "接口"],
-            ProjectType.MOBILE_APP: ["app", "应用", "移动", "手机", "android", "ios"],
-            ProjectType.AUTOMATION: ["自动化", "批量", "定时", "流程", "工作流"]
-        }
+    def detect_project_type(self, description: str, description_lower: Optional[str] = None) -> ProjectType:
+        """智能检测项目类型，已有小写描述时可通过 description_lower 传入"""
+        return _detect_project_type(description_lower or description.lower())
 
-        scores = {}
-        for project_type, keywords in type_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in description_lower)
-            scores[project_type] = score
+    def classify_batch(self, descriptions: List[str]) -> List[ProjectType]:
+        """批量检测项目类型（如对项目历史重新分类），每条描述单次扫描，重复描述复用结果"""
+        return [_detect_project_type(description.lower()) for description in descriptions]
 
-        # 返回得分最高的类型
-        if max(scores.values()) == 0:
-            return ProjectType.UNKNOWN
-
-        return max(scores, key=scores.get)
-
-    def estimate_complexity(self, description: str, project_type: ProjectType) -> str:
-        """评估项目复杂度"""
-        description_lower = description.lower()
-
-        # 复杂度关键词
-        complexity_keywords = {
-            "simple": ["简单", "基础", "单一", "小型", "基础版", "原型"],
-            "medium": ["中等", "标准", "完整", "功能", "系统"],
-            "complex": ["复杂", "高级", "企业级", "大规模", "完整系统", "综合"]
-        }
-
-        for complexity, keywords in complexity_keywords.items():
-            if any(keyword in description_lower for keyword in keywords):
-                return complexity
+    def estimate_complexity(self, description: str, project_type: ProjectType,
+                            description_lower: Optional[str] = None) -> str:
+        """评估项目复杂度，已有小写描述时可通过 description_lower 传入"""
+        complexity = _keyword_complexity(description_lower or description.lower())
+        if complexity is not None:
+            return complexity
 
         # 基于项目类型的默认复杂度
-        default_complexity = {
-            ProjectType.WEB_APP: "medium",
-            ProjectType.CLI_TOOL: "simple",
-            ProjectType.API_SERVICE: "medium",
-            ProjectType.MOBILE_APP: "complex",
-            ProjectType.AUTOMATION: "medium"
-        }
-
-        return default_complexity.get(project_type, "medium")
+        return _DEFAULT_COMPLEXITY.get(project_type, "medium")
 
     def recommend_tech_stack(self, project_type: ProjectType, description: str) -> List[str]:
         """推荐技术栈"""
@@ -224,16 +478,8 @@ class IntelligentEngine:
             if historical_stack:
                 return historical_stack[:3]  # 返回前3个最常用的
 
-        # 基于项目类型的默认推荐
-        default_recommendations = {
-            ProjectType.WEB_APP: ["React", "Node.js", "TypeScript"],
-            ProjectType.CLI_TOOL: ["Node.js", "Commander.js", "JavaScript"],
-            ProjectType.API_SERVICE: ["Python", "FastAPI", "PostgreSQL"],
-            ProjectType.MOBILE_APP: ["React Native", "TypeScript", "Redux"],
-            ProjectType.AUTOMATION: ["Python", "Selenium", "Jinja2"]
-        }
-
-        return default_recommendations.get(project_type, ["JavaScript", "Node.js"])
+        # 基于项目类型的默认推荐（返回新列表，调用方可自由修改）
+        return list(_DEFAULT_TECH_STACKS.get(project_type, ("JavaScript", "Node.js")))
 
     def estimate_time(self, project_type: ProjectType, complexity: str) -> int:
         """估算开发时间（分钟）"""
@@ -245,59 +491,40 @@ class IntelligentEngine:
                 return int(avg_time)
 
         # 基于复杂度的默认估算
-        base_times = {
-            "simple": 60,
-            "medium": 120,
-            "complex": 240
-        }
-
-        project_multipliers = {
-            ProjectType.WEB_APP: 1.2,
-            ProjectType.CLI_TOOL: 0.8,
-            ProjectType.API_SERVICE: 1.0,
-            ProjectType.MOBILE_APP: 1.5,
-            ProjectType.AUTOMATION: 1.1
-        }
-
-        base_time = base_times.get(complexity, 120)
-        multiplier = project_multipliers.get(project_type, 1.0)
+        base_time = _BASE_TIMES.get(complexity, 120)
+        multiplier = _PROJECT_TIME_MULTIPLIERS.get(project_type, 1.0)
 
         return int(base_time * multiplier)
 
     def predict_potential_issues(self, project_type: ProjectType, description: str) -> List[str]:
         """预测潜在问题"""
-        issues = []
-
-        # 基于历史问题预测
+        # 基于历史问题预测：前2个最常见的问题
         type_key = project_type.value
-        if type_key in self.profile.work_patterns:
-            common_issues = self.profile.work_patterns.get("common_pain_points", [])
-            issues.extend(common_issues[:2])  # 返回前2个最常见的问题
-
-        # 基于项目类型的通用问题
-        common_issues_by_type = {
-            ProjectType.WEB_APP: ["状态管理复杂度", "性能优化时机", "浏览器兼容性"],
-            ProjectType.CLI_TOOL: ["错误处理不完整", "参数验证缺失", "跨平台兼容"],
-            ProjectType.API_SERVICE: ["并发处理", "数据一致性", "安全性问题"],
-            ProjectType.MOBILE_APP: ["内存泄漏", "网络优化", "用户体验"],
-            ProjectType.AUTOMATION: ["异常处理", "错误恢复", "日志记录"]
-        }
+        work_patterns = self.profile.work_patterns
+        common_issues = work_patterns.get("common_pain_points", ()) if type_key in work_patterns else ()
 
-        type_issues = common_issues_by_type.get(project_type, [])
-        issues.extend(type_issues[:2])  # 添加2个类型相关问题
+        # 基于项目类型的通用问题：2个类型相关问题
+        type_issues = _COMMON_ISSUES_BY_TYPE.get(project_type, ())
 
-        return list(set(issues))  # 去重
+        # 去重并保持顺序，历史问题在前（最多4项，线性查找比建哈希表更省）
+        issues = []
+        for issue in (*common_issues[:2], *type_issues[:2]):
+            if issue not in issues:
+                issues.append(issue)
+        return issues
 
     def start_project(self, description: str) -> ProjectContext:
         """启动新项目"""
-        # 智能分析
-        project_type = self.detect_project_type(description)
-        complexity = self.estimate_complexity(description, project_type)
+        # 智能分析（描述只转换一次小写）
+        description_lower = description.lower()
+        project_type = self.detect_project_type(description, description_lower)
+        complexity = self.estimate_complexity(description, project_type, description_lower)
         tech_stack = self.recommend_tech_stack(project_type, description)
         estimated_time = self.estimate_time(project_type, complexity)
         potential_issues = self.predict_potential_issues(project_type, description)
 
         # 创建项目上下文
+        now = time.time()
         context = ProjectContext(
             project_type=project_type,
             description=description,
@@ -305,8 +532,8 @@ class IntelligentEngine:
             estimated_time=estimated_time,
             tech_stack=tech_stack,
             current_stage=WorkflowStage.REQUIREMENT,
-            start_time=datetime.now(),
-            last_activity=datetime.now(),
+            start_time=now,
+            last_activity=now,
             issues_found=potential_issues
         )
 
@@ -320,23 +547,30 @@ class IntelligentEngine:
     def _record_project_start(self, context: ProjectContext):
         """记录项目启动"""
         project_record = {
-            "id": hashlib.md5(f"{context.description}{context.start_time}".encode()).hexdigest()[:8],
+            "id": hashlib.blake2b(f"{context.description}{context.start_time}".encode(), digest_size=4).hexdigest(),
             "description": context.description,
-            "project_type": context.project_type.value,
+            "project_type": context.type_key,
             "complexity": context.complexity,
             "tech_stack": context.tech_stack,
-            "start_time": context.start_time.isoformat(),
+            "start_time": context.start_time_iso,
             "estimated_time": context.estimated_time,
             "predicted_issues": context.issues_found
         }
 
-        self.projects.append(project_record)
-        self._save_projects()
+        # 旧格式未迁移成功时不能追加，否则新建的JSONL会让旧记录再也读不到
+        if not self._migrate_legacy_projects():
+            print("项目历史迁移失败，本次项目记录未保存")
+            return
+
+        # 项目历史已加载时同步内存中的列表，未加载时只追加文件，不为此解析全部历史
+        if "projects" in self.__dict__:
+            self.projects.append(project_record)
+        self._append_project(project_record)
 
     def update_learning_data(self, context: ProjectContext, stage: WorkflowStage, feedback: Dict):
         """更新学习数据"""
         # 更新项目偏好
-        type_key = context.project_type.value
+        type_key = context.type_key
         if type_key not in self.profile.project_preferences:
             self.profile.project_preferences[type_key] = {
                 "frequency": 0,
@@ -346,6 +580,7 @@ class IntelligentEngine:
 
         # 更新频率
         self.profile.project_preferences[type_key]["frequency"] += 1
+        self._project_stats = None
 
         # 更新技术栈偏好
         current_tech = self.profile.project_preferences[type_key]["tech_stack"]
@@ -355,7 +590,7 @@ class IntelligentEngine:
 
         # 更新平均时间（如果项目完成）
         if stage == WorkflowStage.COMPLETED:
-            actual_time = (context.last_activity - context.start_time).total_seconds() / 60
+            actual_time = (context.last_activity - context.start_time) / 60
             avg_time = self.profile.project_preferences[type_key]["avg_time"]
             if avg_time == 0:
                 self.profile.project_preferences[type_key]["avg_time"] = actual_time
@@ -370,22 +605,44 @@ class IntelligentEngine:
             if "satisfaction_scores" not in self.profile.work_patterns:
                 self.profile.work_patterns["satisfaction_scores"] = []
 
-            self.profile.work_patterns["satisfaction_scores"].append({
+            satisfaction_scores = self.profile.work_patterns["satisfaction_scores"]
+            satisfaction_scores.append({
                 "timestamp": datetime.now().isoformat(),
                 "project_type": type_key,
                 "score": feedback["satisfaction"],
                 "complexity": context.complexity
             })
 
+            # 只保留最近的满意度记录，档案大小和保存开销不随使用时间增长
+            if len(satisfaction_scores) > _MAX_SATISFACTION_SCORES:
+                del satisfaction_scores[:-_MAX_SATISFACTION_SCORES]
+
         # 保存更新
-        self._save_profile()
+        self._mark_profile_dirty()
+
+    def _get_project_stats(self) -> Tuple[int, Optional[Tuple[str, Dict]]]:
+        """一次遍历项目偏好，得到总项目数和最常做的项目类型"""
+        if self._project_stats is None:
+            preferences = self.profile.project_preferences
+            total_projects = sum(data.get("frequency", 0) for data in preferences.values())
+            favorite = max(preferences.items(), key=lambda x: x[1].get("frequency", 0)) if preferences else None
+            self._project_stats = (total_projects, favorite)
+        return self._project_stats
+
+    def get_total_projects(self) -> int:
+        """获取累计项目数"""
+        return self._get_project_stats()[0]
+
+    def get_favorite_project_type(self) -> Optional[Tuple[str, Dict]]:
+        """获取最常做的项目类型及其偏好数据，无历史时返回None"""
+        return self._get_project_stats()[1]
 
     def get_personalized_recommendations(self, context: ProjectContext) -> List[str]:
         """获取个性化推荐"""
         recommendations = []
 
         # 基于历史经验的推荐
-        type_key = context.project_type.value
+        type_key = context.type_key
         if type_key in self.profile.learned_optimizations:
             optimizations = self.profile.learned_optimizations
             if "requirement_phase_duration" in optimizations:
@@ -407,16 +664,30 @@ class IntelligentEngine:
         return recommendations
 
     def get_workflow_status(self) -> Dict:
-        """获取工作流状态"""
-        if not self.current_context:
+        """获取工作流状态（短时间内的重复查询直接复用上次结果）"""
+        context = self.current_context
+        if not context:
             return {"status": "no_active_project"}
 
-        elapsed_time = (datetime.now() - self.current_context.start_time).total_seconds() / 60
+        # 阶段可能被调用方直接修改，因此同一上下文下还要核对阶段和问题数
+        key = (context.current_stage, len(context.issues_found))
+        now = time.monotonic()
+        cached = self._status_cache
+        if cached is not None and cached[1] is context and cached[2] == key and now - cached[0] < _STATUS_TTL:
+            return cached[3]
+
+        status = self._compute_workflow_status()
+        self._status_cache = (now, context, key, status)
+        return status
+
+    def _compute_workflow_status(self) -> Dict:
+        """计算当前项目的工作流状态"""
+        elapsed_time = (time.time() - self.current_context.start_time) / 60
         progress = self._calculate_progress()
 
         return {
             "status": "active",
-            "project_type": self.current_context.project_type.value,
+            "project_type": self.current_context.type_key,
             "current_stage": self.current_context.current_stage.value,
             "elapsed_time": elapsed_time,
             "estimated_time": self.current_context.estimated_time,
@@ -429,11 +700,4 @@ class IntelligentEngine:
         if not self.current_context:
             return 0.0
 
-        stage_weights = {
-            WorkflowStage.REQUIREMENT: 0.25,
-            WorkflowStage.IMPLEMENTATION: 0.5,
-            WorkflowStage.TESTING: 0.25,
-            WorkflowStage.COMPLETED: 1.0
-        }
-
-        return stage_weights.get(self.current_context.current_stage, 0.0)
\ No newline at end of file
+        return _STAGE_PROGRESS.get(self.current_context.current_stage, 0.0)
\ No newline at end of file
@@ -4,16 +4,122 @@
 基于历史数据和机器学习预测开发中的问题
 """
 
-import json
-import statistics
+import heapq
+import os
 import re
+from functools import cached_property
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from collections import defaultdict, Counter
-
-from intelligent_engine import IntelligentEngine, ProjectType, DeveloperProfile
+from collections import defaultdict, namedtuple
+from operator import itemgetter
+
+from intelligent_engine import (
+    IntelligentEngine, ProjectType, DeveloperProfile, _build_keyword_matcher, _keyword_scores,
+    _loads, _dumps, _dumps_record
+)
+
+
+# 各复杂度维度的关键词
+_COMPLEXITY_INDICATORS = {
+    "technical_keywords": {
+        "high": ["微服务", "分布式", "高并发", "大数据", "机器学习", "区块链"],
+        "medium": ["API", "数据库", "缓存", "消息队列", "异步"],
+        "low": ["CRUD", "简单", "基础", "原型"]
+    },
+    "scope_keywords": {
+        "high": ["完整系统", "企业级", "大规模", "综合性", "平台化"],
+        "medium": ["管理系统", "标准应用", "功能完整"],
+        "low": ["简单工具", "原型", "演示", "基础功能"]
+    },
+    "integration_keywords": {
+        "high": ["多个系统", "第三方", "外部API", "数据同步"],
+        "medium": ["数据库", "文件系统", "网络请求"],
+        "low": ["本地处理", "单机", "独立应用"]
+    }
+}
+
+# (维度, 级别) -> (每个命中关键词的分值, 计分的命中数上限)，未列出的级别不计分
+_COMPLEXITY_WEIGHTS = {
+    ("technical_keywords", "high"): (0.3, 3),
+    ("technical_keywords", "medium"): (0.15, 2),
+    ("technical_keywords", "low"): (-0.1, 2),
+    ("scope_keywords", "high"): (0.25, 3),
+    ("scope_keywords", "medium"): (0.1, 2),
+    ("integration_keywords", "high"): (0.2, 2),
+    ("integration_keywords", "medium"): (0.1, 2),
+}
+
+# 计分级别的关键词按 (维度, 级别) 预编译，一次扫描统计各级别的命中数；
+# 不计分的级别不参与匹配
+_COMPLEXITY_MATCHER = _build_keyword_matcher({
+    (dimension, level): _COMPLEXITY_INDICATORS[dimension][level]
+    for dimension, level in _COMPLEXITY_WEIGHTS
+})
+
+# 功能点指示模式。前六个的匹配范围可能相互重叠，需各自统计；
+# 列表符号和编号互不重叠，合并为一个正则只扫描一遍
+_FEATURE_PATTERNS = (
+    re.compile(r"功能.*?[:：]"),
+    re.compile(r"模块.*?[:：]"),
+    re.compile(r"特性.*?[:：]"),
+    re.compile(r"实现.*?[:：]"),
+    re.compile(r"支持.*?[:：]"),
+    re.compile(r"第.*?个"),
+    re.compile(r"\d+\.|•\s*|-\s*"),
+)
+
+# 各项目类型对复杂度的调整
+_TYPE_COMPLEXITY_ADJUSTMENTS = {
+    ProjectType.WEB_APP: 0.1,
+    ProjectType.API_SERVICE: 0.05,
+    ProjectType.MOBILE_APP: 0.15,
+    ProjectType.CLI_TOOL: -0.1,
+    ProjectType.AUTOMATION: 0.0,
+}
+
+# 各项目类型的基础成功率
+_BASE_SUCCESS_RATES = {
+    ProjectType.WEB_APP: 0.75,
+    ProjectType.API_SERVICE: 0.80,
+    ProjectType.CLI_TOOL: 0.85,
+    ProjectType.MOBILE_APP: 0.70,
+    ProjectType.AUTOMATION: 0.82,
+}
+
+# 各项目类型的基础开发时间（分钟），也是衡量用户实际用时的标准时间
+_BASE_TIMES = {
+    ProjectType.WEB_APP: 120,
+    ProjectType.API_SERVICE: 100,
+    ProjectType.CLI_TOOL: 60,
+    ProjectType.MOBILE_APP: 180,
+    ProjectType.AUTOMATION: 90,
+}
+_STANDARD_TIMES = {project_type.value: minutes for project_type, minutes in _BASE_TIMES.items()}
+
+# 各项目类型的通用建议
+_TYPE_RECOMMENDATIONS = {
+    ProjectType.WEB_APP: ("重视用户体验设计", "考虑SEO优化", "预留性能优化空间"),
+    ProjectType.API_SERVICE: ("重点设计API文档", "考虑版本管理", "重视安全性"),
+    ProjectType.CLI_TOOL: ("重视帮助文档", "考虑跨平台兼容", "优化错误提示"),
+    ProjectType.MOBILE_APP: ("关注电池消耗", "考虑离线功能", "优化启动速度"),
+    ProjectType.AUTOMATION: ("重视异常处理", "添加详细日志", "考虑监控告警"),
+}
+
+# 展平后的风险模式：每列按风险顺序对齐，matcher 以风险下标为类别统计指标词命中数
+RiskTable = namedtuple(
+    "RiskTable", "categories descriptions base_probabilities mitigations early_indicators matcher"
+)
+
+# 新的历史记录先追加到JSONL日志，累计到该条数时才合并进历史数据文件
+_HISTORY_COMPACT_INTERVAL = 20
+
+# 预测结果缓存的条目上限（超出时淘汰最早的条目）
+_PREDICT_CACHE_SIZE = 256
+
+# 短描述的预测本身很快，只缓存长度超过该值的描述
+_PREDICT_CACHE_MIN_LENGTH = 40
 
 
 @dataclass
@@ -44,16 +150,46 @@ class PredictionEngine:
         self.engine = engine
         self.plugin_root = Path(engine.plugin_root)
         self.prediction_dir = self.plugin_root / "data" / "predictions"
-        self.prediction_dir.mkdir(parents=True, exist_ok=True)
+        self._prediction_dir_ready = False
+        self.history_file = self.prediction_dir / "historical_data.json"
+        self.history_log_file = self.prediction_dir / "historical_data.jsonl"  # 尚未合并的新记录，每行一条
+
+        # 日志中尚未合并进历史数据文件的记录数
+        self._history_log_records = 0
+
+        # 风险模式、历史数据等在首次访问对应属性时才加载
+
+        # 按项目类型汇总的历史统计，首次使用时建立，之后随新记录增量更新
+        self._history_index: Optional[Dict[Any, Dict]] = None
+
+        # 预测结果缓存 (描述, 项目类型, 档案版本) -> 预测结果，历史数据变化时清空
+        self._predict_cache: Dict[Tuple[str, str, int], PredictionResult] = {}
 
-        # 风险模式库
-        self.risk_patterns = self._load_risk_patterns()
+    @cached_property
+    def risk_patterns(self) -> Dict:
+        """风险模式库"""
+        return self._load_risk_patterns()
 
-        # 历史成功/失败数据
-        self.historical_data = self._load_historical_data()
+    @cached_property
+    def historical_data(self) -> Dict:
+        """历史成功/失败数据"""
+        return self._load_historical_data()
 
-        # 技术复杂度指标
-        self.complexity_indicators = self._init_complexity_indicators()
+    @cached_property
+    def complexity_indicators(self) -> Dict:
+        """技术复杂度指标"""
+        return self._init_complexity_indicators()
+
+    @cached_property
+    def _risk_table(self) -> RiskTable:
+        """展平并预编译的风险模式"""
+        return self._build_risk_table()
+
+    def _ensure_prediction_dir(self):
+        """首次写入前创建预测数据目录，只读的实例不触碰文件系统"""
+        if not self._prediction_dir_ready:
+            self.prediction_dir.mkdir(parents=True, exist_ok=True)
+            self._prediction_dir_ready = True
 
     def _load_risk_patterns(self) -> Dict:
         """加载风险模式"""
@@ -61,8 +197,8 @@ class PredictionEngine:
 
         if patterns_file.exists():
             try:
-                with open(patterns_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(patterns_file, 'rb') as f:
+                    return _loads(f.read())
             except Exception as e:
                 print(f"加载风险模式失败: {e}")
 
@@ -112,46 +248,137 @@ class PredictionEngine:
         }
 
     def _load_historical_data(self) -> Dict:
-        """加载历史数据"""
-        history_file = self.prediction_dir / "historical_data.json"
+        """加载历史数据，并补上日志中尚未合并的记录"""
+        historical_data = {
+            "projects": [],
+            "success_patterns": {},
+            "failure_patterns": {}
+        }
 
-        if history_file.exists():
+        if self.history_file.exists():
             try:
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.history_file, 'rb') as f:
+                    historical_data = _loads(f.read())
             except Exception as e:
                 print(f"加载历史数据失败: {e}")
 
-        return {
-            "projects": [],
-            "success_patterns": {},
-            "failure_patterns": {}
-        }
+        if self.history_log_file.exists():
+            try:
+                with open(self.history_log_file, 'rb') as f:
+                    records = [_loads(line) for line in f if line.strip()]
+                historical_data.setdefault("projects", []).extend(records)
+                self._history_log_records = len(records)
+            except Exception as e:
+                print(f"加载历史数据日志失败: {e}")
+
+        return historical_data
+
+    def _append_history_record(self, record: Dict):
+        """把新记录追加到日志，累计足够条数后合并进历史数据文件"""
+        try:
+            self._ensure_prediction_dir()
+            with open(self.history_log_file, 'ab') as f:
+                f.write(_dumps_record(record))
+            self._history_log_records += 1
+        except Exception as e:
+            print(f"保存历史数据失败: {e}")
+            return
+
+        if self._history_log_records >= _HISTORY_COMPACT_INTERVAL:
+            self._compact_history()
+
+    def _compact_history(self):
+        """整体重写历史数据文件并清空日志"""
+        tmp_file = self.history_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(_dumps(self.historical_data))
+            os.replace(tmp_file, self.history_file)
+            self.history_log_file.unlink()
+            self._history_log_records = 0
+        except Exception as e:
+            print(f"合并历史数据失败: {e}")
+
+    def _get_history_stats(self, type_key: str) -> Optional[Dict]:
+        """获取某项目类型的历史统计：项目数、成功数、实际/预估时间比率之和及个数"""
+        if self._history_index is None:
+            self._history_index = {}
+            for project in self.historical_data.get("projects", []):
+                self._index_history_record(project)
+        return self._history_index.get(type_key)
+
+    def _index_history_record(self, project: Dict):
+        """把一条历史记录计入对应项目类型的统计"""
+        type_key = project.get("project_type")
+        stats = self._history_index.get(type_key)
+        if stats is None:
+            stats = self._history_index[type_key] = {
+                "count": 0, "successes": 0, "time_ratio_sum": 0.0, "time_ratio_count": 0
+            }
+
+        stats["count"] += 1
+        if project.get("success", False):
+            stats["successes"] += 1
+        if project.get("estimated_time") and project.get("actual_time"):
+            stats["time_ratio_sum"] += project["actual_time"] / project["estimated_time"]
+            stats["time_ratio_count"] += 1
+
+    def _build_risk_table(self) -> RiskTable:
+        """把嵌套的风险模式展平为按列存放的表，与风险名相关的字段提前算好"""
+        rows = [
+            (category, risk_name, risk_data)
+            for category, risks in self.risk_patterns.items()
+            for risk_name, risk_data in risks.items()
+        ]
+        return RiskTable(
+            categories=tuple(category for category, _, _ in rows),
+            descriptions=tuple(risk_name.replace("_", " ").title() for _, risk_name, _ in rows),
+            base_probabilities=tuple(risk_data["probability_base"] for _, _, risk_data in rows),
+            mitigations=tuple(risk_data["mitigation"] for _, _, risk_data in rows),
+            early_indicators=tuple(
+                self._generate_early_indicators(category, risk_name, "") for category, risk_name, _ in rows
+            ),
+            matcher=_build_keyword_matcher({
+                index: risk_data["indicators"] for index, (_, _, risk_data) in enumerate(rows)
+            }),
+        )
 
     def _init_complexity_indicators(self) -> Dict:
         """初始化复杂度指标"""
-        return {
-            "technical_keywords": {
-                "high": ["微服务", "分布式", "高并发", "大数据", "机器学习", "区块链"],
-                "medium": ["API", "数据库", "缓存", "消息队列", "异步"],
-                "low": ["CRUD", "简单", "基础", "原型"]
-            },
-            "scope_keywords": {
-                "high": ["完整系统", "企业级", "大规模", "综合性", "平台化"],
-                "medium": ["管理系统", "标准应用", "功能完整"],
-                "low": ["简单工具", "原型", "演示", "基础功能"]
-            },
-            "integration_keywords": {
-                "high": ["多个系统", "第三方", "外部API", "数据同步"],
-                "medium": ["数据库", "文件系统", "网络请求"],
-                "low": ["本地处理", "单机", "独立应用"]
-            }
-        }
+        return _COMPLEXITY_INDICATORS
 
     def predict_project_outcomes(self, project_description: str, project_type: ProjectType) -> PredictionResult:
-        """预测项目结果"""
+        """预测项目结果（相同描述在档案和历史数据未变时复用结果，调用方不应修改返回值）"""
+        if len(project_description) <= _PREDICT_CACHE_MIN_LENGTH:
+            return self._predict_project_outcomes(project_description, project_type)
+
+        key = (project_description, project_type.value, self.engine.profile_version)
+        result = self._predict_cache.get(key)
+        if result is None:
+            result = self._predict_project_outcomes(project_description, project_type)
+            if len(self._predict_cache) >= _PREDICT_CACHE_SIZE:
+                del self._predict_cache[next(iter(self._predict_cache))]
+            self._predict_cache[key] = result
+        return result
+
+    def predict_batch(self, descriptions: List[str], project_types: List[ProjectType]) -> List[PredictionResult]:
+        """批量预测（如用历史记录重新评估），同一批中相同的描述和类型只预测一次"""
+        if len(descriptions) != len(project_types):
+            raise ValueError("描述与项目类型的数量不一致")
+
+        results: Dict[Tuple[str, ProjectType], PredictionResult] = {}
+        for key in zip(descriptions, project_types):
+            if key not in results:
+                results[key] = self.predict_project_outcomes(*key)
+        return [results[key] for key in zip(descriptions, project_types)]
+
+    def _predict_project_outcomes(self, project_description: str, project_type: ProjectType) -> PredictionResult:
+        """执行一次完整预测"""
+        # 关键词匹配统一使用小写描述，只转换一次
+        description_lower = project_description.lower()
+
         # 分析项目复杂度
-        complexity_score = self._analyze_complexity(project_description, project_type)
+        complexity_score = self._analyze_complexity(description_lower, project_type)
 
         # 基于历史数据预测成功率
         success_prob = self._predict_success_probability(project_type, complexity_score)
@@ -160,7 +387,7 @@ class PredictionEngine:
         estimated_duration = self._predict_duration(project_type, complexity_score, project_description)
 
         # 预测潜在问题
-        predicted_issues = self._predict_issues(project_description, project_type, complexity_score)
+        predicted_issues = self._predict_issues(description_lower, project_type, complexity_score)
 
         # 计算预测置信度
         confidence = self._calculate_confidence(project_type, complexity_score)
@@ -176,47 +403,18 @@ class PredictionEngine:
             recommendations=recommendations
         )
 
-    def _analyze_complexity(self, description: str, project_type: ProjectType) -> float:
-        """分析项目复杂度"""
-        description_lower = description.lower()
+    def _analyze_complexity(self, description_lower: str, project_type: ProjectType) -> float:
+        """分析项目复杂度（description_lower 为已转小写的描述）"""
         complexity_score = 0.5  # 基础分数
 
-        # 技术复杂度分析
-        for level, keywords in self.complexity_indicators["technical_keywords"].items():
-            matches = sum(1 for keyword in keywords if keyword in description_lower)
-            if level == "high" and matches > 0:
-                complexity_score += 0.3 * min(matches, 3)
-            elif level == "medium" and matches > 0:
-                complexity_score += 0.15 * min(matches, 2)
-            elif level == "low" and matches > 0:
-                complexity_score -= 0.1 * min(matches, 2)
-
-        # 范围复杂度分析
-        for level, keywords in self.complexity_indicators["scope_keywords"].items():
-            matches = sum(1 for keyword in keywords if keyword in description_lower)
-            if level == "high" and matches > 0:
-                complexity_score += 0.25 * min(matches, 3)
-            elif level == "medium" and matches > 0:
-                complexity_score += 0.1 * min(matches, 2)
-
-        # 集成复杂度分析
-        for level, keywords in self.complexity_indicators["integration_keywords"].items():
-            matches = sum(1 for keyword in keywords if keyword in description_lower)
-            if level == "high" and matches > 0:
-                complexity_score += 0.2 * min(matches, 2)
-            elif level == "medium" and matches > 0:
-                complexity_score += 0.1 * min(matches, 2)
+        # 技术、范围、集成复杂度分析
+        for key, matches in _keyword_scores(_COMPLEXITY_MATCHER, description_lower).items():
+            if matches > 0:
+                weight, cap = _COMPLEXITY_WEIGHTS[key]
+                complexity_score += weight * min(matches, cap)
 
         # 项目类型调整
-        type_adjustments = {
-            ProjectType.WEB_APP: 0.1,
-            ProjectType.API_SERVICE: 0.05,
-            ProjectType.MOBILE_APP: 0.15,
-            ProjectType.CLI_TOOL: -0.1,
-            ProjectType.AUTOMATION: 0.0
-        }
-
-        complexity_score += type_adjustments.get(project_type, 0)
+        complexity_score += _TYPE_COMPLEXITY_ADJUSTMENTS.get(project_type, 0)
 
         # 限制范围
         return max(0.0, min(1.0, complexity_score))
@@ -224,15 +422,7 @@ class PredictionEngine:
     def _predict_success_probability(self, project_type: ProjectType, complexity_score: float) -> float:
         """预测成功概率"""
         # 基础成功率
-        base_success_rates = {
-            ProjectType.WEB_APP: 0.75,
-            ProjectType.API_SERVICE: 0.80,
-            ProjectType.CLI_TOOL: 0.85,
-            ProjectType.MOBILE_APP: 0.70,
-            ProjectType.AUTOMATION: 0.82
-        }
-
-        base_rate = base_success_rates.get(project_type, 0.75)
+        base_rate = _BASE_SUCCESS_RATES.get(project_type, 0.75)
 
         # 复杂度调整
         complexity_adjustment = (1 - complexity_score) * 0.3  # 复杂度越低，成功率越高
@@ -272,20 +462,14 @@ class PredictionEngine:
 
     def _get_historical_success_factor(self, project_type: ProjectType) -> float:
         """获取历史成功因子"""
-        type_key = project_type.value
-
         # 从历史数据中查找类似项目
-        similar_projects = [
-            p for p in self.historical_data.get("projects", [])
-            if p.get("project_type") == type_key
-        ]
+        stats = self._get_history_stats(project_type.value)
 
-        if not similar_projects:
+        if stats is None:
             return 1.0  # 没有历史数据，使用默认因子
 
         # 计算平均成功率
-        success_projects = sum(1 for p in similar_projects if p.get("success", False))
-        success_rate = success_projects / len(similar_projects)
+        success_rate = stats["successes"] / stats["count"]
 
         # 转换为调整因子
         if success_rate > 0.8:
@@ -298,15 +482,7 @@ class PredictionEngine:
     def _predict_duration(self, project_type: ProjectType, complexity_score: float, description: str) -> int:
         """预测开发时间"""
         # 基础时间
-        base_times = {
-            ProjectType.WEB_APP: 120,
-            ProjectType.API_SERVICE: 100,
-            ProjectType.CLI_TOOL: 60,
-            ProjectType.MOBILE_APP: 180,
-            ProjectType.AUTOMATION: 90
-        }
-
-        base_time = base_times.get(project_type, 120)
+        base_time = _BASE_TIMES.get(project_type, 120)
 
         # 复杂度调整
         complexity_multiplier = 1.0 + (complexity_score * 1.5)  # 复杂度最高可增加150%时间
@@ -339,35 +515,12 @@ class PredictionEngine:
             return 1.0
 
         # 与标准时间比较
-        standard_times = {
-            "web_app": 120,
-            "api_service": 100,
-            "cli_tool": 60,
-            "mobile_app": 180,
-            "automation": 90
-        }
-
-        standard_time = standard_times.get(type_key, 120)
+        standard_time = _STANDARD_TIMES.get(type_key, 120)
         return avg_time / standard_time
 
     def _count_features(self, description: str) -> int:
         """计算功能点数量"""
-        feature_indicators = [
-            r"功能.*?[:：]",
-            r"模块.*?[:：]",
-            r"特性.*?[:：]",
-            r"实现.*?[:：]",
-            r"支持.*?[:：]",
-            r"第.*?个",
-            r"\d+\.",
-            r"•\s*",
-            r"-\s*"
-        ]
-
-        feature_count = 0
-        for pattern in feature_indicators:
-            matches = re.findall(pattern, description)
-            feature_count += len(matches)
+        feature_count = sum(len(pattern.findall(description)) for pattern in _FEATURE_PATTERNS)
 
         # 根据描述长度估算
         word_count = len(description.split())
@@ -378,58 +531,47 @@ class PredictionEngine:
 
     def _get_historical_time_factor(self, project_type: ProjectType) -> float:
         """获取历史时间因子"""
-        type_key = project_type.value
+        stats = self._get_history_stats(project_type.value)
 
-        similar_projects = [
-            p for p in self.historical_data.get("projects", [])
-            if p.get("project_type") == type_key and p.get("estimated_time") and p.get("actual_time")
-        ]
-
-        if not similar_projects:
+        if stats is None or not stats["time_ratio_count"]:
             return 1.0
 
-        # 计算实际时间与预估时间的比率
-        ratios = [p["actual_time"] / p["estimated_time"] for p in similar_projects]
-        avg_ratio = statistics.mean(ratios)
+        # 实际时间与预估时间的平均比率
+        avg_ratio = stats["time_ratio_sum"] / stats["time_ratio_count"]
 
         return avg_ratio
 
-    def _predict_issues(self, description: str, project_type: ProjectType, complexity_score: float) -> List[RiskFactor]:
-        """预测潜在问题"""
+    def _predict_issues(self, description_lower: str, project_type: ProjectType, complexity_score: float) -> List[RiskFactor]:
+        """预测潜在问题（description_lower 为已转小写的描述）"""
         predicted_issues = []
 
-        description_lower = description.lower()
-
         # 基于风险模式预测
-        for category, risks in self.risk_patterns.items():
-            for risk_name, risk_data in risks.items():
-                # 检查指标词
-                indicator_matches = sum(1 for indicator in risk_data["indicators"] if indicator in description_lower)
-
-                if indicator_matches > 0:
-                    # 计算概率
-                    base_probability = risk_data["probability_base"]
-                    indicator_bonus = min(indicator_matches * 0.1, 0.3)  # 最多增加30%
-                    complexity_bonus = complexity_score * 0.2  # 复杂度越高，风险越大
-
-                    probability = min(base_probability + indicator_bonus + complexity_bonus, 0.9)
-
-                    # 确定影响级别
-                    impact = self._determine_impact_level(category, probability, complexity_score)
-
-                    # 生成早期预警指标
-                    early_indicators = self._generate_early_indicators(category, risk_name, description_lower)
-
-                    risk_factor = RiskFactor(
-                        category=category,
-                        description=risk_name.replace("_", " ").title(),
-                        probability=probability,
-                        impact=impact,
-                        mitigation=risk_data["mitigation"],
-                        early_indicators=early_indicators
-                    )
+        risk_table = self._risk_table
+        complexity_bonus = complexity_score * 0.2  # 复杂度越高，风险越大
+        indicator_scores = _keyword_scores(risk_table.matcher, description_lower)
+        for index, indicator_matches in indicator_scores.items():
+            # 检查指标词
+            if indicator_matches > 0:
+                # 计算概率
+                base_probability = risk_table.base_probabilities[index]
+                indicator_bonus = min(indicator_matches * 0.1, 0.3)  # 最多增加30%
+
+                probability = min(base_probability + indicator_bonus + complexity_bonus, 0.9)
+
+                # 确定影响级别
+                category = risk_table.categories[index]
+                impact = self._determine_impact_level(category, probability, complexity_score)
+
+                risk_factor = RiskFactor(
+                    category=category,
+                    description=risk_table.descriptions[index],
+                    probability=probability,
+                    impact=impact,
+                    mitigation=risk_table.mitigations[index],
+                    early_indicators=list(risk_table.early_indicators[index])
+                )
 
-                    predicted_issues.append(risk_factor)
+                predicted_issues.append(risk_factor)
 
         # 基于用户历史问题预测
         historical_issues = self._predict_from_historical_issues(project_type)
@@ -441,15 +583,6 @@ class PredictionEngine:
 
     def _determine_impact_level(self, category: str, probability: float, complexity_score: float) -> str:
         """确定影响级别"""
-        # 基础影响级别
-        base_impacts = {
-            "technical_risks": "high",
-            "timeline_risks": "medium",
-            "quality_risks": "medium"
-        }
-
-        base_impact = base_impacts.get(category, "medium")
-
         # 根据概率和复杂度调整
         if probability > 0.7 or complexity_score > 0.8:
             return "critical"
@@ -534,10 +667,8 @@ class PredictionEngine:
         confidence_factors = []
 
         # 基于历史数据量
-        similar_projects = len([
-            p for p in self.historical_data.get("projects", [])
-            if p.get("project_type") == project_type.value
-        ])
+        stats = self._get_history_stats(project_type.value)
+        similar_projects = stats["count"] if stats else 0
         data_confidence = min(similar_projects / 10.0, 0.3)  # 最多30%
         confidence_factors.append(data_confidence)
 
@@ -568,14 +699,16 @@ class PredictionEngine:
             if high_impact_issues:
                 recommendations.append(f"重点关注高影响风险：{', '.join([issue.description for issue in high_impact_issues[:2]])}")
 
-            # 收集所有缓解措施
-            all_mitigations = []
+            # 统计各缓解措施出现的次数
+            mitigation_counts = defaultdict(int)
             for issue in issues:
-                all_mitigations.extend(issue.mitigation)
+                for mitigation in issue.mitigation:
+                    mitigation_counts[mitigation] += 1
 
-            # 统计最常用的缓解措施
-            mitigation_counts = Counter(all_mitigations)
-            common_mitigations = [mitigation for mitigation, count in mitigation_counts.most_common(3)]
+            # 取最常用的3个缓解措施（次数相同时先出现的优先）
+            common_mitigations = [
+                mitigation for mitigation, _ in heapq.nlargest(3, mitigation_counts.items(), key=itemgetter(1))
+            ]
             if common_mitigations:
                 recommendations.append(f"推荐采取以下预防措施：{', '.join(common_mitigations)}")
 
@@ -586,16 +719,7 @@ class PredictionEngine:
             recommendations.append("低复杂度项目，可以快速迭代，重点关注用户体验")
 
         # 基于项目类型的建议
-        type_recommendations = {
-            "web_app": ["重视用户体验设计", "考虑SEO优化", "预留性能优化空间"],
-            "api_service": ["重点设计API文档", "考虑版本管理", "重视安全性"],
-            "cli_tool": ["重视帮助文档", "考虑跨平台兼容", "优化错误提示"],
-            "mobile_app": ["关注电池消耗", "考虑离线功能", "优化启动速度"],
-            "automation": ["重视异常处理", "添加详细日志", "考虑监控告警"]
-        }
-
-        if project_type.value in type_recommendations:
-            recommendations.extend(type_recommendations[project_type.value])
+        recommendations.extend(_TYPE_RECOMMENDATIONS.get(project_type, ()))
 
         return recommendations[:5]  # 最多5个建议
 
@@ -612,14 +736,12 @@ class PredictionEngine:
 
         # 保存到历史数据
         self.historical_data["projects"].append(accuracy_record)
+        if self._history_index is not None:
+            self._index_history_record(accuracy_record)
+        self._predict_cache.clear()
 
-        # 更新历史数据文件
-        history_file = self.prediction_dir / "historical_data.json"
-        try:
-            with open(history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.historical_data, f, ensure_ascii=False, indent=2, default=str)
-        except Exception as e:
-            print(f"保存历史数据失败: {e}")
+        # 追加到历史数据日志
+        self._append_history_record(accuracy_record)
 
         # 更新风险模式
         self._update_risk_patterns(accuracy_record)
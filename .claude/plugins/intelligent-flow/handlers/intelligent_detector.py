@@ -58,6 +58,12 @@ class IntelligentDetector:
             ]
         }
 
+        # 每类触发模式合并为一个正则，一次搜索判断是否命中任一模式
+        self._trigger_res = {
+            category: re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+            for category, patterns in self.trigger_patterns.items()
+        }
+
         # 智能推荐阈值
         self.recommendation_threshold = 0.7
 
@@ -94,25 +100,19 @@ class IntelligentDetector:
         input_lower = user_input.lower()
 
         # 检测项目创建意图
-        for pattern in self.trigger_patterns["project_creation"]:
-            if re.search(pattern, input_lower):
-                analysis["intent"] = "project_creation"
-                analysis["confidence"] += 0.3
-                break
+        if self._trigger_res["project_creation"].search(input_lower):
+            analysis["intent"] = "project_creation"
+            analysis["confidence"] += 0.3
 
         # 检测功能开发意图
-        for pattern in self.trigger_patterns["feature_development"]:
-            if re.search(pattern, input_lower):
-                analysis["intent"] = "feature_development"
-                analysis["confidence"] += 0.25
-                break
+        if self._trigger_res["feature_development"].search(input_lower):
+            analysis["intent"] = "feature_development"
+            analysis["confidence"] += 0.25
 
         # 检测复杂项目
-        for pattern in self.trigger_patterns["complex_project"]:
-            if re.search(pattern, input_lower):
-                analysis["complexity"] = "complex"
-                analysis["confidence"] += 0.2
-                break
+        if self._trigger_res["complex_project"].search(input_lower):
+            analysis["complexity"] = "complex"
+            analysis["confidence"] += 0.2
 
         # 智能分析项目类型和复杂度
         if analysis["intent"]:
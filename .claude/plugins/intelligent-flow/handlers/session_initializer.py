@@ -7,8 +7,8 @@
 import sys
 import os
 import json
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
 
 # 添加核心模块路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "core"))
@@ -64,11 +64,8 @@ class SessionInitializer:
 
     def _provide_personalized_suggestions(self):
         """提供个性化建议"""
-        profile = self.engine.profile
-
         # 统计用户偏好
-        total_projects = sum(data.get("frequency", 0)
-                           for data in profile.project_preferences.values())
+        total_projects = self.engine.get_total_projects()
 
         if total_projects == 0:
             self._show_new_user_suggestions()
@@ -91,15 +88,13 @@ class SessionInitializer:
         print(f"\n📈 您的开发档案正在形成中...")
 
         # 分析最常做的项目类型
-        if self.engine.profile.project_preferences:
-            most_common = max(self.engine.profile.project_preferences.items(),
-                            key=lambda x: x[1].get("frequency", 0))
-            if most_common[1].get("frequency", 0) > 0:
-                print(f"🎯 您最擅长：{most_common[0]}类项目")
+        most_common = self.engine.get_favorite_project_type()
+        if most_common and most_common[1].get("frequency", 0) > 0:
+            print(f"🎯 您最擅长：{most_common[0]}类项目")
 
-                # 提供进阶建议
-                if most_common[1].get("frequency", 0) >= 3:
-                    print(f"💡 建议：尝试 /flow adaptive 获得个性化流程")
+            # 提供进阶建议
+            if most_common[1].get("frequency", 0) >= 3:
+                print(f"💡 建议：尝试 /flow adaptive 获得个性化流程")
 
         print(f"📚 查看学习进展：/flow learn")
 
@@ -127,7 +122,7 @@ class SessionInitializer:
 
     def _show_smart_tips(self):
         """显示智能提示"""
-        current_hour = datetime.now().hour
+        current_hour = time.localtime().tm_hour
 
         # 基于时间的智能提示
         time_tips = {
@@ -144,7 +139,7 @@ class SessionInitializer:
                 break
 
         # 基于工作日的提示
-        weekday = datetime.now().weekday()
+        weekday = time.localtime().tm_wday
         if weekday == 0:  # 周一
             print(f"📅 新的一周，适合规划新项目")
         elif weekday == 4:  # 周五
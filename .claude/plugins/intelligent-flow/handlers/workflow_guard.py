@@ -7,8 +7,8 @@
 import sys
 import os
 import json
+import time
 from pathlib import Path
-from datetime import datetime
 
 # 添加核心模块路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "core"))
@@ -195,7 +195,7 @@ class WorkflowGuard:
 
         # 如果在同一阶段停留时间过长，可能存在问题
         if context.current_stage == WorkflowStage.IMPLEMENTATION:
-            elapsed = (datetime.now() - context.start_time).total_seconds() / 60
+            elapsed = (time.time() - context.start_time) / 60
             if elapsed > context.estimated_time * 1.5:
                 return True
 
@@ -41,7 +41,6 @@ def initialize_data_files():
             "technology_preferences": {},
             "quality_standards": {}
         },
-        "data/projects.json": [],
         "data/patterns.json": {
             "project_type_patterns": {},
             "technology_patterns": {},
@@ -43,7 +43,6 @@ def test_data_structure():
 
     data_files = [
         "data/developer_profile.json",
-        "data/projects.json",
         "data/patterns.json",
         "data/adaptive/adaptive_config.json",
         "data/predictions/risk_patterns.json"